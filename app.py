@@ -1,9 +1,21 @@
-import os, json, base64
+import os
+from collections.abc import Mapping
 from datetime import date
-import pandas as pd
-import altair as alt
 import streamlit as st
 
+import assets
+import background
+import content
+import downloads
+import perf
+import profiles
+import remote
+import render
+import search
+import store
+import timeline
+import watcher
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Page config
 # ────────────────────────────────────────────────────────────────────────────────
@@ -12,455 +24,386 @@ st.set_page_config(page_title="Promotion Summary", page_icon="🌟", layout="wid
 # ────────────────────────────────────────────────────────────────────────────────
 # Styles
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("""
-<style>
-/* overall bg */
-body { background-color: #FCFBF7; }
-.block-container { max-width: 1200px; background-color: #FCFBF7; }
-
-/* hero + section headings */
-.hero { padding:22px 26px; border-radius:18px;
-        background:linear-gradient(135deg,#4F46E520,#06B6D420);
-        border:1px solid #e5e7eb; }
-.section-title { font-size:20px; font-weight:700; margin:0 0 8px 0; }
-.divider-dark { height:3px; background:#1f2937; opacity:.1; border-radius:999px; }
-
-/* chips + tags */
-.pill { display:inline-flex; align-items:center; gap:6px; padding:6px 12px;
-       border-radius:999px; background:#4F46E515; color:#4F46E5; font-weight:600;
-       font-size:12px; margin-right:6px; }
-.tag { display:inline-block; font-size:12px; padding:3px 8px; border-radius:999px;
-       border:1px solid #e5e7eb; margin-right:6px; color:#475569; }
-
-/* intro block (no card/box) */
-.intro-wrap h1 { font-size:34px; margin:0 0 8px 0; }
-.intro-lead { 
-    color:#374151; 
-    font-size:15px; 
-    line-height:1.35; 
-    margin-bottom:16px;  /* Reduced from 28px to 16px */
-}
-.intro-bullets {
-    color:#374151;
-    font-size:15px;
-    line-height:1.35;
-    margin-top:16px;    /* Reduced from 28px to 16px */
-}
-.intro-bullets ul {
-    margin:0;
-    padding-left:20px;
-}
-
-/* deep-dive spacing */
-.dd-sep { height: 2px; }                 /* was 6px */
-.dd-rule {
-    height: 4px;
-    border-radius: 999px;
-    margin: 24px 0 8px 0;   /* was 22px, now 8px */
-}
-
-.badge { 
-    display:inline-block; 
-    font-size:11px; 
-    padding:2px 8px; 
-    border-radius:999px; 
-}
-.badge-was { 
-    background:#fee2e2; 
-    color:#b91c1c; 
-    border:1px solid #fecaca; 
-}
-.badge-now { 
-    background:#dcfce7; 
-    color:#166534; 
-    border:1px solid #bbf7d0; 
-}
-.card { 
-    background:#FCFBF7;  /* Match the overall background color */
-    border:1px solid #e5e7eb; 
-    border-radius:16px; 
-    padding:16px; 
-    box-shadow:0 1px 3px rgba(0,0,0,.04);
-    margin-bottom: 12px;  /* Add spacing between cards */
-}
-/* Tab styling */
-.stTabs [data-baseweb="tab-list"] {
-    gap: 24px;
-    margin-bottom: 16px;
-}
-.stTabs [data-baseweb="tab"] {
-    height: auto;
-    font-size: 64px !important;  /* Increased from 42px to 64px to match section headers */
-    font-weight: 700 !important;
-    color: #475569;
-    padding: 0;
-    line-height: 1.2 !important;  /* Added to improve spacing */
-}
-.stTabs [aria-selected="true"] {
-    color: #1f2937 !important;
-}
-.small-tab-header {
-    font-size: 16px;
-    font-weight: 600;
-    color: #475569;
-    margin-bottom: 12px;
-}
-
-/* small helper for logo column in timeline */
-.logo-cell { text-align:center; }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(render.STYLE, unsafe_allow_html=True)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Load content
 # ────────────────────────────────────────────────────────────────────────────────
-def load_content(path="data/content.json"):
+remote.start()  # PROMO_CONTENT_URL: profiles are mirrored from the content service (no-op otherwise)
+
+# ?profile=<slug> serves data/profiles/<slug>.json; unknown slugs are rejected
+# from the in-memory index without touching disk
+PROFILE = st.query_params.get("profile", "")
+if store.DB_PATH:
+    # PROMO_CONTENT_DB: sections live in SQLite (store.py) instead of JSON files
+    known = (PROFILE or store.DEFAULT) in store.slugs()
+else:
+    known = profiles.content_path(PROFILE) is not None
+if not known:
+    st.error(f"Unknown profile: {PROFILE!r}")
+    st.stop()
+
+def load_content():
+    if store.DB_PATH:
+        # one indexed version lookup per rerun; only edited sections are re-parsed
+        return store.load(PROFILE or store.DEFAULT)
+    path = profiles.content_path(PROFILE)
     if not os.path.exists(path):
-        st.error("data/content.json not found. Create it and restart.")
+        st.error(f"{path} not found. Create it and restart.")
         st.stop()
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    # shared across sessions, re-parsed only when the file changes; read-only view
+    return content.load(path)
+
+def load_digests():
+    # per-section content hashes: each section's caches are keyed on its own slice
+    if store.DB_PATH:
+        return store.digests(PROFILE or store.DEFAULT)
+    return content.digests(profiles.content_path(PROFILE))
 
-C = load_content()
+watcher.start()  # once per process: content/asset changes are re-parsed once, then pushed
+
+with perf.section("content-load"):
+    seen_version = watcher.version()  # read first: a change during the load still triggers a rerun
+    C = load_content()
+    D = load_digests()
+
+# Progressive render: hero + intro text go out first; the slow parts (image
+# variant build, timeline compile) run in the background pool meanwhile and
+# fill their placeholders at the end of the script. PROMO_PROGRESSIVE=0 renders
+# everything synchronously in page order.
+PROGRESSIVE = os.environ.get("PROMO_PROGRESSIVE", "1") != "0"
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ────────────────────────────────────────────────────────────────────────────────
-SECTION_ICONS = {
-    "Overview":"📌","Relationship Building":"🤝","Problem Solving":"🧩",
-    "Communication":"🗣️","Commercial Craft":"💼","Data & AI SME Expertise":"🧠"
-}
-SECTION_COLORS = {
-    "Overview":"#0ea5e9","Relationship Building":"#22c55e","Problem Solving":"#6366f1",
-    "Communication":"#f59e0b","Commercial Craft":"#ec4899","Data & AI SME Expertise":"#14b8a6"
-}
-
-def bullet_preview(items, n=2):
-    out=[]
-    for x in items:
-        s=str(x).strip()
-        if not s or s.endswith(":"): continue
-        out.append(s)
-        if len(out)==n: break
-    return out
-
-def render_grouped(items):
-    if not items:
-        return
-    groups=[]; cur=[]; found=False
-    for raw in items:
-        s=str(raw).strip()
-        if not s: continue
-        if s.endswith(":"):
-            found=True
-            if cur: groups.append(cur)
-            cur=[s]
-        else:
-            if not cur and found: cur=["Details:"]
-            cur.append(s)
-    if cur: groups.append(cur)
-    if not found:
-        for s in items:
-            s=str(s).strip()
-            if s: st.markdown(f"- {s}")
-        return
-    for grp in groups:
-        if not grp: continue
-        st.markdown(f"**{grp[0]}**")
-        for bullet in grp[1:]:
-            bullet=str(bullet).strip()
-            if bullet: st.markdown(f"- {bullet}")
-
-# image helpers (for Altair mark_image)
-def _first_existing(paths):
-    for p in paths:
-        if p and os.path.exists(p):
-            return p
-    return None
-
-def img_to_data_url(path):
-    if not path or not os.path.exists(path):
-        return None
-    ext = os.path.splitext(path)[1].lstrip(".").lower() or "png"
-    with open(path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
-    return f"data:image/{ext};base64,{b64}"
+def blocks(section, fn, value=None):
+    # rendered markup of one section, rebuilt only when that section's slice changes
+    return render.cached(fn, D.get(section), C.get(section, {}) if value is None else value)
+
+def page_block(digest, fn, items, i, sub=0):
+    # one window of a long list, memoised per content version like a whole section
+    key = digest and f"{sub}-{i}-{render.PAGE}-{digest}"
+    return render.cached(fn, key, (items, i * render.PAGE))
+
+def _more(key):
+    st.session_state[key] = st.session_state.get(key, 1) + 1
+
+def windowed(key, items, draw):
+    # the windows this session opened, then "Show more": per-rerun work is bounded
+    # by what the viewer asked for, not by the length of the list
+    key = f"pages-{key}"
+    n = min(st.session_state.get(key, 1), render.pages(items))
+    for i in range(n):
+        draw(i)
+    left = len(items) - n * render.PAGE
+    if left > 0:
+        st.button(f"Show more ({left} left)", key=f"more-{key}", on_click=_more, args=(key,))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Timeline with logo axis (no configure_* on subcharts!)
 # ────────────────────────────────────────────────────────────────────────────────
-def timeline_gantt_with_logo_axis(ranges):
+# icon map: every client organisation on the timeline is looked up in the
+# asset index (profile's files first), by its content "logos" file name if it
+# has one, else by its own name -- in memory, no path probing
+def timeline_logos(ranges, logo_files, slug=""):
+    logos = {org: assets.find(logo_files.get(org, org), slug) for org in timeline.orgs(ranges)}
+    return {org: path for org, path in logos.items() if path}
+
+def timeline_spec(ranges, logo_files, digest=None, slug=""):
+    # thread-safe (no st.* calls): also runs in the background pool
+    assets.ensure_built()  # once per process: resized/recompressed image variants
+    # memoised on (ranges, resolved logos, today): repeat renders are a dict lookup
+    return timeline.compiled_spec(ranges, timeline_logos(ranges, logo_files, slug), today=date.today(), digest=digest)
+
+def timeline_gantt_with_logo_axis(ranges, logo_files, digest=None, sync=False):
     if not ranges:
         st.warning("Add timeline_ranges in data/content.json to render the timeline.")
         return
 
-    # build dataframe
-    df = pd.DataFrame(ranges)
-    for col in ["lane","start","end","label"]:
-        if col not in df.columns:
-            st.error(f"timeline_ranges missing '{col}'"); return
-
-    df["start"] = pd.to_datetime(df["start"], errors="coerce")
-    df["end"]   = pd.to_datetime(df["end"],   errors="coerce").fillna(pd.to_datetime(date.today()))
-
-    # client vs internal, pretty org label
-    df["is_client"] = ~df["lane"].astype(str).str.startswith("Internal")
-    df["org"] = df["lane"].astype(str).str.replace("Client — ","", regex=False)
-    df.loc[~df["is_client"], "org"] = df.loc[~df["is_client"], "lane"]
-
-    # keep original ordering: clients (sorted by name) on top, then internals
-    lanes = df["lane"].tolist()
-    # unique in original order:
-    seen = set(); ordered_lanes=[]
-    for l in lanes:
-        if l not in seen:
-            seen.add(l); ordered_lanes.append(l)
-    y_order = [l.replace("Client — ","") if not l.startswith("Internal") else l for l in ordered_lanes]
-
-    # icon map (tries several likely paths)
-    logo_candidates = {
-        "AEMO":          ["assets/aemo.png","data/assets/aemo.png","aemo.png"],
-        "Australia Post":["assets/auspost.png","data/assets/auspost.png","auspost.png"],
-        "IAG":           ["assets/iag.png","data/assets/iag.png","iag.png"],
-        "Vanguard":      ["assets/vanguard.png","data/assets/vanguard.png","vanguard.png"],
-    }
-    df["icon"] = None
-    for org, candidates in logo_candidates.items():
-        path = _first_existing(candidates)
-        if path:
-            data_url = img_to_data_url(path)
-            df.loc[df["org"]==org, "icon"] = data_url
-
-    # color grouping
-    df["group"] = df["is_client"].map({True:"Client", False:"Internal"})
-
-    # bars (main timeline)
-    bars = (
-        alt.Chart(df)
-        .mark_bar(cornerRadius=6, stroke="white", strokeWidth=0.6)
-        .encode(
-            x=alt.X("start:T", title="", axis=alt.Axis(format="%b %Y")),
-            x2=alt.X2("end:T"),
-            y=alt.Y("org:N", sort=y_order, title="", axis=alt.Axis(labels=False)), # Hide labels
-            color=alt.Color(
-                "group:N", title="Work type",
-                scale=alt.Scale(domain=["Client","Internal"], range=["#6366F1","#94A3B8"]),
-                legend=alt.Legend(orient="bottom", direction="horizontal")
-            ),
-            tooltip=[
-                alt.Tooltip("org:N", title="Organisation"),
-                alt.Tooltip("start:T", title="Start"),
-                alt.Tooltip("end:T", title="End"),
-            ],
-        )
-        .properties(width=980, height=240)
-    )
-
-    # logo column (clients only); tooltip shows ONLY organisation
-    df_logo = df[(df["is_client"]) & (df["icon"].notna())].copy()
-    logos = (
-        alt.Chart(df_logo)
-        .mark_image()
-        .encode(
-            y=alt.Y("org:N", sort=y_order, title=""),
-            x=alt.value(26),  # center inside narrow column
-            url=alt.Url("icon:N"),
-            tooltip=[alt.Tooltip("org:N", title="Organisation")]
-        )
-        .properties(width=60, height=240)
-    )
-
-    # concat WITHOUT configure on subcharts; apply on final chart only
-    chart = alt.hconcat(logos, bars, spacing=8).resolve_scale(y='shared')
-    chart = chart.configure_view(stroke=None)
-
-    st.altair_chart(chart, use_container_width=True)
+    try:
+        spec = timeline_spec(ranges, logo_files, digest, PROFILE)
+    except ValueError as e:
+        st.error(str(e)); return
+
+    if not sync:
+        # zoom/pan/legend filtering all happen in the browser: no rerun
+        st.vega_lite_chart(spec, use_container_width=True)
+        return
+    # on demand only: hand the brushed window back (reruns just this fragment)
+    event = st.vega_lite_chart(spec, use_container_width=True, on_select="rerun",
+                               selection_mode=[timeline.BRUSH], key="timeline_chart")
+    window = timeline.selected_window(event)
+    if window:
+        st.caption(f"Selected period: {window[0]:%d %b %Y} – {window[1]:%d %b %Y}")
+
+def show_intro_photo(slot, name):
+    with perf.section("intro-photo"):
+        # show provided picture if available: named in content, else the profile's photo-role image
+        pic = assets.find(name, PROFILE) if name else next(iter(assets.by_role("photo", PROFILE)), None)
+        if pic:
+            # the same page-relative app/static URL the timeline spec uses (resolves under
+            # server.baseUrlPath; st.image only passes root-absolute ones through)
+            src = assets.static_url(pic)
+            if src:
+                slot.markdown(f"<img src='{src}' alt='' style='width:100%'>", unsafe_allow_html=True)
+            else:  # no static route: st.image serves the file
+                slot.image(pic, use_container_width=True)
+
+if PROGRESSIVE:
+    # warm reruns find both in memory here; only a miss goes to the shared pool,
+    # where it could queue behind other sessions' work (download builds)
+    ranges = C.get("timeline_ranges", [])
+    if assets.ready():
+        assets_ready = background.done()
+    else:
+        assets_ready = background.once("assets", assets.ensure_built)
+    if not ranges or (assets.ready() and timeline.cached_spec(
+            ranges, timeline_logos(ranges, C.get("logos", {}), PROFILE), date.today(), D.get("timeline_ranges"))):
+        timeline_ready = background.done()
+    else:
+        # compiling the spec also pays the pandas/Altair import off the render thread
+        timeline_ready = background.submit(timeline_spec, ranges, C.get("logos", {}),
+                                           D.get("timeline_ranges"), PROFILE)
+else:
+    assets.ensure_built()
+
+# download artifacts: built in the background once per content version; the tab only serves them
+DOWNLOAD_KEY = downloads.key(D)
+downloads.prepare(C, DOWNLOAD_KEY, PROFILE)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Hero
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("""
-<div class="hero">
-  <h1 style="margin:0 0 6px 0;">🌟 Promotion Summary</h1>
-  <div style="color:#475569; font-size:14px;">{summary}</div>
-  <div style="margin-top:10px;">
-    <span class="pill">Delivery Leadership</span>
-    <span class="pill">Stakeholder Trust</span>
-    <span class="pill">Commercial Impact</span>
-    <span class="pill">Data & AI</span>
-  </div>
-</div>
-""".format(summary=C.get("summary","")), unsafe_allow_html=True)
+with perf.section("hero"):
+    st.markdown(render.hero(C.get("summary","")), unsafe_allow_html=True)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Intro (no white card)
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("<div class='intro-wrap'>", unsafe_allow_html=True)
-cols = st.columns([1,1.6])
-with cols[0]:
-    # show provided picture if available
-    pic_candidates = ["assets/intro_photo.png","data/assets/intro_photo.png","intro_photo.png"]
-    pic = _first_existing(pic_candidates)
-    if pic:
-        st.image(pic, use_container_width=True)
-with cols[1]:
-    st.markdown("<h1>Hi, I am Pratyush!</h1>", unsafe_allow_html=True)
-    st.markdown(
-        "<div class='intro-lead'>"
-        "I am a Business Technical Consultant with 5+ years' experience driving key data transformations across finance, insurance, logistics, and sports. "
-        "I've worked with organisations like Vanguard, IAG, Australia Post and the AFL. "
-        "Here's a quick summary of how I fulfil all the metrics of a Senior Consultant who works at Mantel."
-        "</div>",
-        unsafe_allow_html=True
-    )
-    
-    # bullets from prompt
-    st.markdown("<div class='intro-bullets'>", unsafe_allow_html=True)
-    bullets = [
-        "Data & AI Delivery Leadership: Run complex reporting and transformation streams end-to-end, from scoping to clean client handover.",
-        "Stakeholder Engagement: Trusted by senior stakeholders for clear communication and proactive updates, even in high-pressure situations.",
-        "Structured Problem Solving: Diagnose tricky grain/data issues and design pragmatic fixes without losing momentum.",
-        "Commercial Craft: Shape proposals and pitches by combining technical understanding with business storytelling.",
-        "Internal Enablement: Curate pathways like the dbt learning program to scale skills internally.",
-        "AI/ML Integration: Leverage LLM-powered solutions to reduce manual work and accelerate insights.",
-    ]
-    for b in bullets:
-        st.markdown(f"- {b}")
+INTRO = C.get("intro", {})
+with perf.section("intro"):
+    st.markdown("<div class='intro-wrap'>", unsafe_allow_html=True)
+    cols = st.columns([1,1.6])
+    with cols[0]:
+        # filled once the image variants are built (immediately when warm)
+        pic_slot = st.empty()
+        photo_pending = PROGRESSIVE and not assets_ready.done()
+        if not photo_pending:
+            show_intro_photo(pic_slot, INTRO.get("photo"))
+    with cols[1]:
+        title = INTRO.get("title") or (f"Hi, I am {C['name']}!" if C.get("name") else "Hi!")
+        st.markdown(f"<h1>{title}</h1>", unsafe_allow_html=True)
+        if INTRO.get("lead"):
+            st.markdown(f"<div class='intro-lead'>{INTRO['lead']}</div>", unsafe_allow_html=True)
+
+        # bullets from the profile's intro
+        st.markdown("<div class='intro-bullets'>", unsafe_allow_html=True)
+        st.markdown(render.bullets(INTRO.get("bullets", [])))
+        st.markdown("</div>", unsafe_allow_html=True)
     st.markdown("</div>", unsafe_allow_html=True)
-st.markdown("</div>", unsafe_allow_html=True)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Search: typing reruns only this fragment; the index is shared per content version
+# ────────────────────────────────────────────────────────────────────────────────
+@st.fragment
+def search_box(C, D):
+    q = st.text_input("Search evidence", key="search_q", placeholder="dbt, AEMO, stakeholder…",
+                      label_visibility="collapsed")
+    if not q.strip():
+        return
+    with perf.section("search"):
+        hits = search.index(C, D).search(q)
+    if not hits:
+        st.caption(f"No matches for “{q}”.")
+        return
+    st.markdown("\n".join(f"- [{h['label']}](#{h['anchor']}) · **{h['title']}** — {h['snippet']}" for h in hits))
+
+search_box(C, D)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Journey Timeline (with logo axis)
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("<div class='section-title'>Journey at Mantel</div>", unsafe_allow_html=True)
-st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-timeline_gantt_with_logo_axis(C.get("timeline_ranges", []))
+# Major sections are fragments: an interaction inside one reruns only that
+# section, against the inputs it was last called with (shared content views).
+@st.fragment
+def journey_section(ranges, logo_files, digest=None):
+    with perf.section("timeline"):
+        sync = st.session_state.get("timeline_sync", False)
+        timeline_gantt_with_logo_axis(ranges, logo_files, digest, sync=sync)
+        st.toggle("Report selected period", key="timeline_sync",
+                  help="Brush the strip under the chart to zoom; drag to pan. Turn this on to send the window back to the app.")
+
+st.markdown(render.section_title("Journey at Mantel"), unsafe_allow_html=True)
+timeline_slot = st.empty()
+timeline_pending = PROGRESSIVE and not timeline_ready.done()
+if timeline_pending:
+    timeline_slot.caption("Loading timeline…")
+else:
+    with timeline_slot.container():
+        journey_section(C.get("timeline_ranges", []), C.get("logos", {}), D.get("timeline_ranges"))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Highlights (kept concise)
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("<div class='section-title'>Highlights</div>", unsafe_allow_html=True)
-st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-highs = C.get("highlights", [])
-if highs:
-    cols = st.columns(min(3, len(highs)))
-    for i, h in enumerate(highs):
-        with cols[i % len(cols)]:
-            st.markdown(f"**{h.get('title','')}**")
-            meta = h.get("metric", ""); ctx = h.get("context","")
-            if meta: st.markdown(f"<span class='tag'>{meta}</span>", unsafe_allow_html=True)
-            if ctx:  st.markdown(f"<div style='margin:.25rem 0 1rem 0; color:#475569;'>{ctx}</div>", unsafe_allow_html=True)
-else:
-    st.caption("No highlights available yet.")
+with perf.section("highlights"):
+    st.markdown(render.section_title("Highlights", "highlights"), unsafe_allow_html=True)
+    highs = C.get("highlights", [])
+    if highs:
+        cols = st.columns(min(3, len(highs)))
+        for i, h in enumerate(blocks("highlights", render.highlights)):
+            with cols[i % len(cols)]:
+                st.markdown(h, unsafe_allow_html=True)
+    else:
+        st.caption("No highlights available yet.")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # KPI Deep-Dives
 # ────────────────────────────────────────────────────────────────────────────────
-st.markdown("<div class='section-title'>KPI Deep-Dives</div>", unsafe_allow_html=True)
-st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-matrix = C.get("matrix", {})
-if matrix:
-    for k, bullets in matrix.items():
-        icon = SECTION_ICONS.get(k,"📄")
-        color = SECTION_COLORS.get(k,"#4F46E5")
-        st.markdown(
-            f"<div style='display:flex; align-items:center; gap:8px; margin:2px 0 6px 0;'>"
-            f"<div style='font-size:20px'>{icon}</div><div style='font-weight:700'>{k}</div></div>",
-            unsafe_allow_html=True
-        )
-        prev = bullet_preview(bullets, 2)
-        if prev:
-            for p in prev: st.markdown(f"• {p}")
-        with st.expander("Details"):
-            render_grouped(bullets)
-        st.markdown(f"<div class='dd-sep'></div><div class='dd-rule' style='background:{color}'></div>", unsafe_allow_html=True)
-else:
-    st.caption("No KPI details available yet.")
+@st.fragment
+def kpi_section(kpis, matrix, digest=None):
+    with perf.section("kpi-deep-dives"):
+        st.markdown(render.section_title("KPI Deep-Dives", "kpi-deep-dives"), unsafe_allow_html=True)
+        if kpis:
+            for k, (name, header, color) in enumerate(kpis):
+                # previous KPI's rule rides along with this header: one element instead of two
+                st.markdown(header, unsafe_allow_html=True)
+                items = matrix.get(name, ())
+                with st.expander("Details"):
+                    if items:
+                        # one element per window of bullets, not per bullet
+                        windowed(f"kpi-{k}", items, lambda i: st.markdown(
+                            page_block(digest, render.grouped_page, items, i, sub=k)))
+            st.markdown(render.kpi_rule(color), unsafe_allow_html=True)
+        else:
+            st.caption("No KPI details available yet.")
+
+kpi_section(blocks("matrix", render.kpi_blocks), C.get("matrix", {}), D.get("matrix"))
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Certifications & Achievements + Client Quote
 # ────────────────────────────────────────────────────────────────────────────────
-ach = C.get("achievements", [])
-if ach:
-    st.markdown("<div class='section-title'>Certifications & Achievements</div>", unsafe_allow_html=True)
-    st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-    cols = st.columns(min(3, len(ach)))
-    for i, a in enumerate(ach):
-        with cols[i % len(cols)]:
-            icon=a.get("icon","🎓"); title=a.get("title",""); issuer=a.get("issuer","")
-            when=a.get("date",""); note=a.get("note",""); link=a.get("link")
-            line = f"{icon} **{title}** — {issuer}" + (f" · {when}" if when else "")
-            if link: line = f"[{line}]({link})"
-            st.markdown(line, unsafe_allow_html=True)
-            if note: st.caption(note)
-
-    # optional: what clients say (first testimonial)
-    fs = C.get("feedback_section", {})
-    tlist = fs.get("testimonials", []) if isinstance(fs, dict) else []
-    if tlist:
-        t = tlist[0]
-        who = " — ".join([x for x in [t.get("name"), t.get("org")] if x])
-        st.markdown("")
-        st.markdown("*What clients say*")
-        st.markdown(f"> “{t.get('quote','')}” — **{who}**")
+with perf.section("achievements"):
+    ach = C.get("achievements", [])
+    if ach:
+        st.markdown(render.section_title("Certifications & Achievements", "achievements"), unsafe_allow_html=True)
+        cols = st.columns(min(3, len(ach)))
+        for i, (line, note) in enumerate(blocks("achievements", render.achievements)):
+            with cols[i % len(cols)]:
+                st.markdown(line, unsafe_allow_html=True)
+                if note: st.caption(note)
+
+        # optional: what clients say (first testimonial)
+        fs = C.get("feedback_section", {})
+        tlist = fs.get("testimonials", []) if isinstance(fs, Mapping) else []
+        if tlist:
+            t = tlist[0]
+            who = " — ".join([x for x in [t.get("name"), t.get("org")] if x])
+            st.markdown("")
+            st.markdown("*What clients say*")
+            st.markdown(f"> “{t.get('quote','')}” — **{who}**")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Tabs: Feedback (quotes only) + Growth Plan
 # ────────────────────────────────────────────────────────────────────────────────
 st.markdown("<div style='height: 40px'></div>", unsafe_allow_html=True)  # Add some spacing
-tabs = st.tabs(["📋 Feedback", "📈 Growth Plan"])
-
-with tabs[0]:
-    # What people say section
-    st.markdown("<div class='section-title'>What people say 🗣️</div>", unsafe_allow_html=True)
-    st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-    fs = C.get("feedback_section", {})
-    quotes = fs.get("quotes", []) if isinstance(fs, dict) else []
-    if quotes:
-        for q in quotes:
-            who = " — ".join([x for x in [q.get("name"), q.get("org")] if x])
-            st.markdown(f'> "{q.get("quote","")}"  \n— **{who}**')
-            st.write("")
-    else:
-        st.info("No feedback quotes available yet.")
-        
-    # Add spacing between sections
-    st.write("")
-    
-    # Incorporating Feedback section
-    st.markdown("<div class='section-title'>Incorporating Feedback 💬 + 🔄</div>", unsafe_allow_html=True)
-    st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-    
-    improvements = fs.get("improve", [])
-    for i, card in enumerate(improvements):
-        st.markdown(f"**{card.get('title','')}**")
-        was = card.get("was","")
-        now = card.get("now","")
-        if was:
-            st.markdown(f"<span class='badge badge-was'>Was</span> {was}", unsafe_allow_html=True)
-        if now:
-            st.markdown(f"<span class='badge badge-now'>Now</span> {now}", unsafe_allow_html=True)
-
-        evp = card.get("evidence_points", []) or []
-        evs = card.get("evidence", "")
-        if evp or evs:
-            with st.expander("Evidence"):
-                if evp:
-                    for b in evp:
-                        st.markdown(f"- {b}")
-                elif evs:
-                    st.markdown(evs)
-
-        # ✅ Only show divider if this is NOT the last card
-        if i < len(improvements) - 1:
-            st.markdown(
-                f"<div class='dd-sep'></div><div class='dd-rule' style='background:#6366F1'></div>",
-                unsafe_allow_html=True
-            )
-
-
-with tabs[1]:
-    st.markdown("<div class='section-title'>Growth Plan 📈</div>", unsafe_allow_html=True)
-    st.markdown("<div class='divider-dark'></div>", unsafe_allow_html=True)
-    for g in C.get("growth", []):
-        st.markdown(f"- {g}")
\ No newline at end of file
+
+@st.fragment
+def feedback_tabs(fs, growth, digests):
+    tabs = st.tabs(["📋 Feedback", "📈 Growth Plan", "⬇️ Download"])
+    fs = fs if isinstance(fs, Mapping) else {}
+    quotes, cards = fs.get("quotes", ()), fs.get("improve", ())
+    digest = digests.get("feedback_section")
+
+    def card_page(i):
+        for card, ev in page_block(digest, render.improve_page, cards, i):
+            # divider between cards is emitted with the next card's header (never after the last)
+            st.markdown(card, unsafe_allow_html=True)
+            if ev:
+                with st.expander("Evidence"):
+                    st.markdown(ev)
+
+    with tabs[0]:
+        with perf.section("feedback-tab"):
+            # What people say section
+            st.markdown(render.section_title("What people say 🗣️", "what-people-say"), unsafe_allow_html=True)
+            if quotes:
+                windowed("quotes", quotes, lambda i: st.markdown(
+                    page_block(digest, render.quotes_page, quotes, i), unsafe_allow_html=True))
+            else:
+                st.info("No feedback quotes available yet.")
+
+            # Incorporating Feedback section (spacing between sections rides along)
+            st.markdown(render.SPACER + render.section_title("Incorporating Feedback 💬 + 🔄", "incorporating-feedback"), unsafe_allow_html=True)
+            windowed("improve", cards, card_page)
+
+    with tabs[1]:
+        with perf.section("growth-tab"):
+            st.markdown(render.section_title("Growth Plan 📈"), unsafe_allow_html=True)
+            windowed("growth", growth, lambda i: st.markdown(
+                page_block(digests.get("growth"), render.bullets_page, growth, i)))
+
+    with tabs[2]:
+        download_tab(C, DOWNLOAD_KEY, PROFILE)
+
+@st.fragment
+def download_tab(C, key, slug):
+    st.markdown(render.section_title("Download ⬇️"), unsafe_allow_html=True)
+    waiting = False
+    for kind, (label, file_name, mime) in downloads.KINDS.items():
+        state, value = downloads.status(kind, C, key, slug)
+        if state == "ready":
+            st.download_button(f"⬇️ Download {label}", data=value, file_name=file_name, mime=mime, key=f"dl-{kind}")
+        elif state == "failed":
+            st.error(f"Could not build the {label}: {value}")
+        else:
+            waiting = True
+            st.button(f"⏳ Preparing {label}…", disabled=True, key=f"dl-{kind}")
+    if waiting:
+        download_poll(C, key, slug)
+
+@st.fragment(run_every=1.0)
+def download_poll(C, key, slug):
+    # ticks only while something is still building; a failure ends it too
+    if all(downloads.status(kind, C, key, slug)[0] != "building" for kind in downloads.KINDS):
+        st.rerun(scope="app")
+
+feedback_tabs(C.get("feedback_section", {}), C.get("growth", []), D)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Deferred slots (progressive mode): fill in as the background work finishes
+# ────────────────────────────────────────────────────────────────────────────────
+if photo_pending:
+    background.wait(assets_ready)
+    show_intro_photo(pic_slot, INTRO.get("photo"))
+if timeline_pending:
+    background.wait(timeline_ready)
+    with timeline_slot.container():
+        journey_section(C.get("timeline_ranges", []), C.get("logos", {}), D.get("timeline_ranges"))
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Live reload (?live=1 or PROMO_LIVE_RELOAD=1): a cheap per-session tick reruns
+# the page once the watcher moved
+# ────────────────────────────────────────────────────────────────────────────────
+@st.fragment(run_every=watcher.RELOAD_EVERY)
+def live_reload(seen):
+    if watcher.version() != seen:
+        st.rerun(scope="app")
+
+if watcher.ENABLED and (watcher.LIVE or st.query_params.get("live") == "1"):
+    live_reload(seen_version)
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Debug overlay: ?debug=metrics (needs PROMO_METRICS=1 and/or PROMO_PROFILE=1)
+# ────────────────────────────────────────────────────────────────────────────────
+if perf.ENABLED and st.query_params.get("debug") == "metrics":
+    if perf.METRICS:
+        rows = ["| section | n | p50 ms | p95 ms | p99 ms |", "|---|---:|---:|---:|---:|"]
+        rows += [f"| {k} | {m['count']} | {m['p50_ms']} | {m['p95_ms']} | {m['p99_ms']} |"
+                 for k, m in perf.snapshot().items()]
+        st.sidebar.markdown("**Section timings (this worker)**\n\n" + "\n".join(rows))
+    if perf.PROFILE:
+        rep = perf.report()
+        rows = ["| startup | ms |", "|---|---:|"]
+        rows += [f"| import {k} | {v} |" for k, v in rep["imports_ms"].items()]
+        rows += [f"| first render {k} | {v} |" for k, v in rep["first_render_ms"].items()]
+        st.sidebar.markdown("**Startup profile (this worker)**\n\n" + "\n".join(rows))
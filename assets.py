@@ -0,0 +1,316 @@
+"""Asset build stage: right-sized, recompressed image variants in a hashed cache.
+
+Run once per process (``ensure_built()`` from app.py) or ahead of deploy:
+
+    python assets.py build
+
+Each source image under ``SOURCE_DIRS`` is resized to 2x its display size and
+re-encoded as WebP (optimised PNG if Pillow has no WebP support) into
+``CACHE_DIR/<stem>-<hash>.<ext>``. The hash covers the source bytes and the
+build parameters, so variants are immutable and safe to cache forever.
+Request-path lookups (``resolve``/``data_url``/``url``) never encode anything:
+they map a source path to its built variant, or fall back to the source.
+
+With ``URL_MODE = "static"`` (default) variants living under Streamlit's app
+static folder are referenced as short ``app/static/...`` URLs, so browsers
+fetch each image once and cache it across reruns and sessions instead of
+receiving it base64-inlined in every payload. Needs
+``server.enableStaticServing`` (see .streamlit/config.toml); ``"inline"``
+restores data URLs.
+
+The manifest doubles as the asset index: every source is recorded with its
+scope (profile slug, "" for the shared dirs), normalised name, role,
+dimensions and content hash. ``find("Australia Post")``, ``find("aemo.png",
+slug)`` and ``by_role("photo", slug)`` are in-memory lookups -- no path
+probing or stats on the request path -- so a new client's logo only needs a
+file whose name matches the organisation (or a ``logos`` entry in content).
+Logos and other images fall back to the shared dirs; a profile's photo and
+testimonials (``PERSONAL_ROLES``) only ever come from its own directory.
+A source without a built variant (unwritable cache, an image Pillow can't
+open) is indexed as itself, so a failed build only costs the resize.
+"""
+import base64, hashlib, json, os, re, sys, threading
+
+import perf
+import profiles
+from lru import LRU
+
+SOURCE_DIRS = profiles.SHARED_ASSET_DIRS  # plus every data/profiles/<slug>/assets
+CACHE_DIR = os.environ.get("PROMO_ASSET_CACHE", "static/assets")
+MANIFEST = "manifest.json"
+STATIC_DIR = "static"             # Streamlit serves <app dir>/static at app/static/
+URL_MODE = os.environ.get("PROMO_ASSET_URLS", "static")
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp"}
+
+# 2x the size each role is displayed at (box the image is fitted into)
+ROLE_SIZES = {
+    "logo":  (80, 80),      # timeline logo column, drawn at 40px
+    "photo": (880, 1600),   # intro photo, ~440px wide column
+    "testimonial": (1200, 1200),  # thank-you screenshots (*thanks*, *testimonial*)
+    "image": (1200, 1200),  # anything else
+}
+PERSONAL_ROLES = {"photo", "testimonial"}  # never borrowed from the shared dirs by a profile
+WEBP_QUALITY = 80
+BUILD_VERSION = 2           # bump to invalidate every variant
+
+_lock = threading.Lock()
+_built = False
+_variants = {}              # normalised source path -> variant path
+_index = {}                 # (scope, normalised name) -> manifest entry
+_roles = {}                 # (scope, role) -> [manifest entries]
+_served = set()             # variant paths known to exist (no stat when building URLs)
+_data_urls = LRU(4096, max_bytes=int(os.environ.get("PROMO_DATA_URL_CACHE_MB", "32")) * 2**20)  # variant path -> data URL
+
+
+def _norm(path):
+    return os.path.normpath(path)
+
+
+def normalise(name):
+    """'Australia Post', 'australia_post.PNG' -> 'australiapost'."""
+    stem, ext = os.path.splitext(os.path.basename(str(name)))
+    if ext.lower() not in IMAGE_EXTS:
+        stem = os.path.basename(str(name))  # an organisation name, dots and all
+    return re.sub(r"[^a-z0-9]", "", stem.lower())
+
+
+def _scope(src):
+    """Profile slug owning ``src``, "" for the shared asset dirs."""
+    rel = os.path.relpath(os.path.abspath(src), os.path.abspath(profiles.PROFILES_DIR))
+    parts = rel.split(os.sep)
+    return parts[0] if len(parts) == 3 and parts[1] == "assets" and not rel.startswith(os.pardir) else ""
+
+
+def _role(name, size):
+    stem = os.path.splitext(name)[0].lower()
+    if stem.startswith("intro_photo"):
+        return "photo"
+    if "thanks" in stem or "testimonial" in stem:
+        return "testimonial"
+    return "logo" if size and max(size) <= 400 else "image"
+
+
+def _sources():
+    for d in SOURCE_DIRS + profiles.profile_asset_dirs():
+        if not os.path.isdir(d):
+            continue
+        for name in sorted(os.listdir(d)):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTS:
+                yield os.path.join(d, name)
+
+
+def _load_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _encode(im, box, fmt, out):
+    from PIL import Image
+
+    im = im.convert("RGBA")
+    im.thumbnail(box, Image.LANCZOS)  # only ever shrinks
+    tmp = f"{out}.{os.getpid()}.tmp"  # per process: workers scaling out build the same variants
+    try:
+        if fmt == "webp":
+            im.save(tmp, "WEBP", quality=WEBP_QUALITY, method=4)
+        else:
+            im.save(tmp, "PNG", optimize=True)
+        os.replace(tmp, out)
+    except OSError:
+        if not os.path.exists(out):  # same name, same bytes: another process finishing first is fine
+            raise
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _build_one(src, cache_dir):
+    from PIL import Image, features
+
+    with open(src, "rb") as f:
+        raw = f.read()
+    with Image.open(src) as im:
+        role = _role(os.path.basename(src), im.size)
+        box = ROLE_SIZES[role]
+        fmt = "webp" if features.check("webp") else "png"
+        key = hashlib.sha256(raw + json.dumps([BUILD_VERSION, box, fmt, WEBP_QUALITY]).encode()).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(src))[0]
+        out = os.path.join(cache_dir, f"{stem}-{key}.{fmt}")
+        if not os.path.exists(out):
+            with perf.section("image-encode"):
+                _encode(im, box, fmt, out)
+        width, height = im.size
+    return {"role": role, "variant": out, "bytes_in": len(raw), "bytes_out": os.path.getsize(out),
+            "width": width, "height": height, "sha256": hashlib.sha256(raw).hexdigest(),
+            "scope": _scope(src), "name": normalise(src)}
+
+
+def build(cache_dir=None):
+    """Build every missing variant and rewrite the manifest; returns the manifest."""
+    cache_dir = cache_dir or CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+    previous = _load_manifest(cache_dir)
+    manifest = {}
+    for src in _sources():
+        key = _norm(src)
+        try:
+            st = os.stat(src)
+            stat = [st.st_mtime_ns, st.st_size, BUILD_VERSION]
+            prev = previous.get(key)
+            if prev and prev.get("stat") == stat and os.path.exists(prev["variant"]):
+                manifest[key] = prev  # unchanged since the last build: don't even read it
+                continue
+            manifest[key] = dict(_build_one(src, cache_dir), stat=stat)
+        except Exception as e:  # a broken image must not take the app down
+            print(f"assets: skipping {src}: {e}", file=sys.stderr)
+    tmp = os.path.join(cache_dir, f"{MANIFEST}.{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, os.path.join(cache_dir, MANIFEST))
+    return manifest
+
+
+def ensure_built():
+    """Once per process: build (or pick up) the variant cache."""
+    global _built
+    if _built:
+        return
+    with _lock:
+        if _built:
+            return
+        try:
+            manifest = build()
+        except OSError:  # read-only deploy: use whatever was built ahead of time
+            manifest = _load_manifest(CACHE_DIR)
+        _index_manifest(manifest)
+        _built = True
+
+
+def ready():
+    """True once this process has its asset index (``ensure_built``/``load_index`` ran)."""
+    return _built
+
+
+def load_index():
+    """Index whatever was built ahead of time, without building (worker processes
+    of a batch job, where the parent already ran the build)."""
+    global _built
+    with _lock:
+        _index_manifest(_load_manifest(CACHE_DIR))
+        _built = True
+
+
+def _source_entry(src):
+    """Index entry serving a source image as is (no variant was built for it)."""
+    try:
+        from PIL import Image
+        with Image.open(src) as im:
+            size = im.size
+    except Exception:
+        size = None
+    width, height = size or (None, None)
+    return {"role": _role(os.path.basename(src), size), "variant": src, "width": width, "height": height,
+            "scope": _scope(src), "name": normalise(src)}
+
+
+def _index_manifest(manifest):
+    entries = {src: entry for src, entry in manifest.items() if os.path.exists(entry["variant"])}
+    for src in _sources():
+        entries.setdefault(_norm(src), None)
+    variants, index, roles = {}, {}, {}
+    for src, entry in sorted(entries.items()):
+        if entry is None:
+            entry = _source_entry(src)
+        else:
+            variants[src] = entry["variant"]
+        entry = dict(entry, source=src)
+        scope, name = entry.get("scope", ""), entry.get("name") or normalise(src)
+        index.setdefault((scope, name), entry)  # first source dir wins, as path probing did
+        roles.setdefault((scope, entry["role"]), []).append(entry)
+    _variants.clear(); _variants.update(variants)
+    _index.clear(); _index.update(index)
+    _roles.clear(); _roles.update(roles)
+    _served.clear(); _served.update(_norm(v) for v in variants.values())
+
+
+def info(name, slug=""):
+    """Manifest entry (variant, role, width, height, sha256, ...) for an asset
+    or organisation name; the profile's own files win over shared ones."""
+    key = normalise(name)
+    if not key:
+        return None
+    entry = _index.get((slug, key))
+    if entry is None:
+        entry = _index.get(("", key))
+        if entry is not None and slug and entry["role"] in PERSONAL_ROLES:
+            return None  # the default document's person, not this profile's
+    return entry
+
+
+def find(name, slug=""):
+    """Built variant for ``name`` (file or organisation name), None if unknown."""
+    entry = info(name, slug)
+    return entry["variant"] if entry else None
+
+
+def by_role(role, slug=""):
+    """Variants of one role ("photo", "logo", "testimonial", "image"), profile's first.
+    A profile only gets its own photos and testimonials, never the shared ones."""
+    if not slug:
+        return [e["variant"] for e in _roles.get(("", role), [])]
+    own = _roles.get((slug, role), [])
+    common = [] if role in PERSONAL_ROLES else _roles.get(("", role), [])
+    return [e["variant"] for e in own + common]
+
+
+def rebuild():
+    """Pick up added/changed source images (unchanged ones are skipped by stat)."""
+    global _built
+    with _lock:
+        _built = False
+    ensure_built()
+
+
+def resolve(path):
+    """Built variant for a source image path, or the path itself if there is none."""
+    if not path:
+        return path
+    return _variants.get(_norm(path), path)
+
+
+def data_url(path):
+    if not path or not os.path.exists(path):
+        return None
+    hit = _data_urls.get(path)
+    if hit is None:
+        with perf.section("image-encode"), open(path, "rb") as f:
+            b64 = base64.b64encode(f.read()).decode("utf-8")
+        ext = os.path.splitext(path)[1].lstrip(".").lower() or "png"
+        hit = f"data:image/{ext};base64,{b64}"
+        if _norm(path).startswith(_norm(CACHE_DIR) + os.sep):  # only variants are immutable
+            _data_urls.put(path, hit)
+    return hit
+
+
+def static_url(path):
+    """``app/static/...`` URL for ``path`` in static mode, else None."""
+    if URL_MODE == "static" and path:
+        rel = os.path.relpath(_norm(path), STATIC_DIR)
+        if not rel.startswith(os.pardir) and (_norm(path) in _served or os.path.exists(path)):
+            return "app/static/" + rel.replace(os.sep, "/")
+    return None
+
+
+def url(path):
+    """URL the browser should load ``path`` from: static route if servable, else a data URL."""
+    return static_url(path) or data_url(path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["build"]:
+        sys.exit("usage: python assets.py build")
+    for src, v in build().items():
+        print(f"{src:40s} {v['role']:11s} {v['bytes_in']:>8d} -> {v['bytes_out']:>7d}  {v['variant']}")
@@ -0,0 +1,49 @@
+"""Process-wide worker pool for work that should stay off the render path.
+
+app.py is re-executed on every rerun, so anything that must outlive a single
+script run (the executor, in-flight futures) lives here. ``once`` de-duplicates
+by key so concurrent sessions share one in-flight computation.
+"""
+import os, threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+MAX_WORKERS = int(os.environ.get("PROMO_WORKERS", "4"))
+
+_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="promo")
+_lock = threading.RLock()  # done-callbacks may run inline while held
+_inflight = {}
+
+
+def submit(fn, *args, **kwargs):
+    return _pool.submit(fn, *args, **kwargs)
+
+
+def done(value=None):
+    """An already-settled future, for work the caller found cached."""
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+
+def once(key, fn, *args, **kwargs):
+    """Future for ``fn(*args)``; callers with the same key share it until it finishes."""
+    with _lock:
+        fut = _inflight.get(key)
+        if fut is None:
+            fut = _inflight[key] = _pool.submit(fn, *args, **kwargs)
+            fut.add_done_callback(lambda f, k=key: _forget(k, f))
+        return fut
+
+
+def _forget(key, fut):
+    with _lock:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+
+def wait(fut, timeout=None):
+    """Block until ``fut`` settles; errors are left for the synchronous path to report."""
+    try:
+        return fut.result(timeout)
+    except Exception:
+        return None
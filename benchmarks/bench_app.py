@@ -0,0 +1,145 @@
+"""Headless benchmark for app.py (Streamlit AppTest).
+
+Runs the dashboard against data/content.json and synthetic scaled-up copies
+(matrix bullets, timeline ranges, quotes and improvement cards multiplied by
+each scale factor). The image variants are built (or picked up) before any
+timed run, so the numbers do not depend on whether static/assets already
+exists; that cold start is reported on its own as ``assets_ms`` (no budget:
+it is a one-off per deploy). Then, per scale:
+
+  first_ms    first script run (cold caches for that content)
+  rerun_ms    median of warm reruns
+  elements    number of emitted elements/blocks
+  payload_kb  serialised size of the element protos (what goes over the websocket)
+  peak_mb     tracemalloc peak during one warm rerun
+
+Any metric above its budget in benchmarks/budgets.json, or a scale at which the
+app raises, fails the run (exit 1). Budgets are the measured values plus a
+margin (~1.5x for timings, ~15-25% for sizes); a change that moves a number
+updates its budget in the same commit.
+
+    python benchmarks/bench_app.py                    # scales 1,10,100,1000
+    python benchmarks/bench_app.py --scales 1,10,100,1000 --json out.json
+"""
+import argparse, copy, json, os, statistics, sys, tempfile, time, tracemalloc
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS = os.path.join(ROOT, "benchmarks", "budgets.json")
+METRICS = ["first_ms", "rerun_ms", "elements", "payload_kb", "peak_mb"]
+
+
+def scaled(base, n):
+    """``base`` with every list-shaped section ``n`` times longer."""
+    c = copy.deepcopy(base)
+    if n == 1:
+        return c
+    c["matrix"] = {k: list(v) * n for k, v in base.get("matrix", {}).items()}
+    ranges = []
+    for i in range(n):
+        # same lanes, history shifted back ~13 months per copy
+        shift = timedelta(days=400 * i)
+        for r in base.get("timeline_ranges", []):
+            r = dict(r)
+            for col in ("start", "end"):
+                if r.get(col):
+                    r[col] = (date.fromisoformat(r[col]) - shift).isoformat()
+            ranges.append(r)
+    c["timeline_ranges"] = ranges
+    fs = c.get("feedback_section", {})
+    for key in ("quotes", "improve"):
+        if key in fs:
+            fs[key] = list(fs[key]) * n
+    return c
+
+
+def _walk(node):
+    yield node
+    for child in (getattr(node, "children", None) or {}).values():
+        yield from _walk(child)
+
+
+def measure(content_path, reruns=5):
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["PROMO_CONTENT"] = content_path
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=300)
+    t0 = time.perf_counter(); at.run(); first = time.perf_counter() - t0
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter(); at.run(); times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    at.run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    nodes = [n for n in _walk(at._tree) if getattr(n, "proto", None) is not None]
+    return {
+        "first_ms": round(first * 1e3, 1),
+        "rerun_ms": round(statistics.median(times) * 1e3, 1),
+        "elements": len(nodes),
+        "payload_kb": round(sum(n.proto.ByteSize() for n in nodes) / 1024, 1),
+        "peak_mb": round(peak / 2**20, 1),
+    }
+
+
+def check(results, budgets):
+    failures = []
+    for scale, metrics in results.items():
+        if "error" in metrics:
+            failures.append(f"{scale}x app raised: {metrics['error']}")
+            continue
+        for name, limit in budgets.get(scale, {}).items():
+            if metrics.get(name, 0) > limit:
+                failures.append(f"{scale}x {name}: {metrics[name]} > budget {limit}")
+    return failures
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--content", default=os.path.join(ROOT, "data", "content.json"))
+    ap.add_argument("--scales", default="1,10,100,1000")
+    ap.add_argument("--reruns", type=int, default=5)
+    ap.add_argument("--budgets", default=BUDGETS)
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args(argv)
+
+    os.chdir(ROOT)  # app.py resolves data/ and static/ relative to the cwd
+    sys.path.insert(0, ROOT)
+    import assets  # the same module object app.py gets under AppTest
+    t0 = time.perf_counter()
+    assets.ensure_built()
+    print(f"assets_ms={(time.perf_counter() - t0) * 1e3:.1f}", flush=True)
+    with open(args.content, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in [int(x) for x in args.scales.split(",")]:
+            path = os.path.join(tmp, f"content_{n}x.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(scaled(base, n), f)
+            try:
+                results[str(n)] = measure(path, args.reruns)
+            except Exception as e:  # a scale that crashes the app is a failed budget, not a crashed suite
+                results[str(n)] = {"error": str(e).splitlines()[0]}
+                print(f"{n:>5}x  ERROR {results[str(n)]['error']}", flush=True)
+                continue
+            print(f"{n:>5}x  " + "  ".join(f"{k}={results[str(n)][k]}" for k in METRICS), flush=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    budgets = {}
+    if args.budgets and os.path.exists(args.budgets):
+        with open(args.budgets, "r", encoding="utf-8") as f:
+            budgets = json.load(f)
+    failures = check(results, budgets)
+    for msg in failures:
+        print("BUDGET EXCEEDED:", msg, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Multi-worker cold start, with and without the shared cache tier (shared.py).
+
+Simulates N worker processes on one host: each is a fresh interpreter that
+renders the dashboard once (Streamlit AppTest) and reports its first-request
+latency and peak RSS. Worker 1 starts alone; workers 2..N then start
+together, as they would after a deploy or a scale-out. Per mode it prints
+the first worker's latency, the median of the others and the total RSS.
+
+    python benchmarks/bench_workers.py                 # 4 workers
+    python benchmarks/bench_workers.py --workers 8 --json out.json
+"""
+import argparse, json, os, resource, statistics, subprocess, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child():
+    """One worker: first render of app.py, then peak RSS of this process."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=300)
+    t0 = time.perf_counter(); at.run(); first = time.perf_counter() - t0
+    if at.exception:
+        raise SystemExit(at.exception[0].message)
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    print(json.dumps({"first_ms": round(first * 1e3, 1), "rss_mb": round(rss_kb / 1024, 1)}))
+
+
+def spawn(env):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], env=env,
+                          capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "worker failed")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run_mode(n, shared_dir):
+    env = dict(os.environ, PROMO_WATCH="0")
+    env.pop("PROMO_SHARED_CACHE", None)
+    if shared_dir:
+        env["PROMO_SHARED_CACHE"] = shared_dir
+    first = spawn(env)
+    with ThreadPoolExecutor(max_workers=max(1, n - 1)) as pool:
+        rest = list(pool.map(lambda _: spawn(env), range(n - 1)))
+    workers = [first] + rest
+    return {
+        "first_worker_ms": first["first_ms"],
+        "other_workers_ms": statistics.median(w["first_ms"] for w in rest) if rest else None,
+        "total_rss_mb": round(sum(w["rss_mb"] for w in workers), 1),
+        "workers": workers,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--json", help="also write results to this file")
+    ap.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+    if args.child:
+        return child()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, shared_dir in (("private", None), ("shared", os.path.join(tmp, "cache"))):
+            r = results[mode] = run_mode(args.workers, shared_dir)
+            print(f"{mode:8s} workers={args.workers}  first={r['first_worker_ms']} ms  "
+                  f"others(median)={r['other_workers_ms']} ms  total_rss={r['total_rss_mb']} MB", flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
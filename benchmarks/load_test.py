@@ -0,0 +1,299 @@
+"""Concurrent-session load generator for one app.py worker, all on localhost.
+
+Starts ``streamlit run app.py`` on a free port (or targets ``--url``), opens
+N simulated browser sessions on Streamlit's websocket protocol
+(``/_stcore/stream``, protobuf BackMsg/ForwardMsg) and replays an interaction
+script in each, with per-session jitter. Reports per step kind:
+
+  rerun latency   p50/p95/p99 from sending ``rerun_script`` to ``script_finished``
+  throughput      completed script/fragment runs per second over the whole test
+  memory          worker RSS (``/proc/<pid>/status``) idle, with all sessions
+                  connected and at the end; growth per session
+
+Like a browser, every session also honours ``auto_rerun`` (fragment ticks:
+download polling, and live reload when the page is opened with ``?live=1``)
+for as long as it is connected.
+
+Expanders and tabs are client-side in Streamlit: opening "Details" or
+switching to "Growth Plan" sends nothing to the server. The default script
+therefore replays each such interaction as think time followed by the full
+rerun a widget-driven interaction would cost, which is an upper bound on
+what real viewers do. The widgets that do reach the server -- the search box,
+"Show more" and the "Report selected period" toggle -- are sent like the
+browser sends them: the new widget state plus the id of the fragment they
+live in, so those steps measure fragment-scoped reruns. A widget the page
+doesn't render (no list long enough for "Show more") is counted as skipped.
+
+    python benchmarks/load_test.py --sessions 20 --duration 60
+    python benchmarks/load_test.py --url http://localhost:8501 --sessions 50
+"""
+import argparse, asyncio, json, os, random, socket, statistics, subprocess, sys, time, urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (kind, label, think seconds before the step, widget: (label prefix, value) or None)
+SCRIPT = [
+    ("load",  "open page", 0.0, None),
+    ("search", "type a search", 1.0, ("Search evidence", "stakeholder")),
+    ("rerun", "open every KPI Details", 1.0, None),
+    ("more", "Show more", 1.0, ("Show more", True)),
+    ("toggle", "turn on Report selected period", 1.0, ("Report selected period", True)),
+    ("toggle", "turn it off again", 1.0, ("Report selected period", False)),
+    ("search", "clear the search", 1.0, ("Search evidence", "")),
+    ("rerun", "switch to Growth Plan tab", 2.0, None),
+    ("rerun", "back to Feedback, expand Evidence", 2.0, None),
+    ("rerun", "reload", 3.0, None),
+]
+WIDGETS = {"button", "checkbox", "text_input"}  # element types the script drives
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(port):
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc, url
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("streamlit did not become healthy")
+
+
+class Session:
+    def __init__(self, url, query, stats):
+        self.ws_url = url.replace("http", "ws", 1) + "/_stcore/stream"
+        self.query = query
+        self.stats = stats                 # kind -> list of seconds
+        self.page_hash = ""
+        self.finished = None               # future resolved by the next script_finished
+        self.busy = asyncio.Lock()         # one run at a time per session, like the browser
+        self.ticks = {}                    # fragment id -> task replaying its run_every
+        self.full_run = False              # the run in flight is a whole-page run
+        self.registered = set()            # fragment ids that asked for auto_rerun this full run
+        self.elements = {}                 # widget label -> (element type, widget id, fragment id)
+        self.widgets = {}                  # widget id -> WidgetState, sent with every rerun
+
+    async def run(self, script, until, connected):
+        import websockets
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        self.BackMsg, self.ForwardMsg, self.WidgetState = BackMsg, ForwardMsg, WidgetState
+        async with websockets.connect(self.ws_url, subprotocols=["streamlit"], max_size=None) as ws:
+            self.ws = ws
+            reader = asyncio.create_task(self._read())
+            try:
+                first = True
+                while first or time.monotonic() < until:
+                    for kind, _label, think, widget in script:
+                        await asyncio.sleep(think * random.uniform(0.5, 1.5))
+                        if time.monotonic() >= until and not first:
+                            break
+                        if widget:
+                            await self._interact(kind, *widget)
+                        else:
+                            await self._rerun(kind)
+                        if first:
+                            first = False
+                            connected()
+            finally:
+                for t in self.ticks.values():
+                    t.cancel()
+                reader.cancel()
+
+    async def _interact(self, kind, label, value):
+        """Set one widget and rerun the fragment it lives in (the whole page if none)."""
+        hit = next((e for l, e in self.elements.items() if l.startswith(label)), None)
+        if hit is None:
+            self.stats.setdefault("skipped", []).append(0.0)
+            return
+        etype, wid, fragment_id = hit
+        state = self.WidgetState(id=wid)
+        if etype == "button":
+            state.trigger_value = bool(value)
+        elif etype == "checkbox":
+            state.bool_value = bool(value)
+        else:
+            state.string_value = str(value)
+        self.widgets[wid] = state
+        try:
+            await self._rerun(kind, fragment_id, auto=False)
+        finally:
+            if etype == "button":  # a trigger is only true for the run it caused
+                self.widgets.pop(wid, None)
+
+    async def _rerun(self, kind, fragment_id="", auto=True):
+        msg = self.BackMsg()
+        cs = msg.rerun_script
+        cs.query_string = self.query
+        cs.page_script_hash = self.page_hash
+        cs.widget_states.widgets.extend(self.widgets.values())
+        if fragment_id:
+            cs.fragment_id = fragment_id
+            cs.is_auto_rerun = auto
+        async with self.busy:
+            self.full_run = not fragment_id
+            if self.full_run:
+                self.registered = set()
+            self.finished = asyncio.get_running_loop().create_future()
+            t0 = time.perf_counter()
+            await self.ws.send(msg.SerializeToString())
+            try:
+                await asyncio.wait_for(self.finished, 120)
+                self.stats.setdefault(kind, []).append(time.perf_counter() - t0)
+            except asyncio.TimeoutError:
+                self.stats.setdefault("timeouts", []).append(1)
+            finally:
+                self.finished = None
+
+    async def _tick(self, fragment_id, interval):
+        while True:
+            await asyncio.sleep(interval)
+            await self._rerun("fragment", fragment_id)
+
+    async def _read(self):
+        while True:
+            fwd = self.ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = fwd.new_session.page_script_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                el = fwd.delta.new_element
+                etype = el.WhichOneof("type")
+                if etype in WIDGETS:
+                    w = getattr(el, etype)
+                    self.elements[w.label] = (etype, w.id, fwd.delta.fragment_id)
+            elif kind == "auto_rerun" and fwd.auto_rerun.fragment_id:
+                fid = fwd.auto_rerun.fragment_id
+                self.registered.add(fid)
+                if fid not in self.ticks:
+                    self.ticks[fid] = asyncio.create_task(self._tick(fid, fwd.auto_rerun.interval))
+            elif kind == "script_finished" and fwd.script_finished != fwd.FINISHED_EARLY_FOR_RERUN:
+                if self.full_run:
+                    # like the browser: a fragment the page no longer renders stops ticking
+                    for fid in [f for f in self.ticks if f not in self.registered]:
+                        self.ticks.pop(fid).cancel()
+                if self.finished is not None and not self.finished.done():
+                    self.finished.set_result(fwd.script_finished)
+
+
+def _pct(vals, q):
+    vals = sorted(vals)
+    return round(vals[min(len(vals) - 1, int(q * len(vals)))] * 1e3, 1)
+
+
+async def _load(url, n, duration, query, ramp, pid):
+    # one throwaway page load first: module imports and process-wide caches are
+    # paid once per worker, not per session
+    await Session(url, query, {}).run(SCRIPT[:1], time.monotonic(), lambda: None)
+    stats, mem = {}, {"idle_mb": rss_mb(pid) if pid else None}
+    ready = asyncio.Event()
+    connected = [0]
+
+    def on_connected():
+        connected[0] += 1
+        if connected[0] == n:
+            ready.set()
+
+    t0 = time.monotonic()
+    until = t0 + duration
+    tasks = []
+    for i in range(n):
+        tasks.append(asyncio.create_task(Session(url, query, stats).run(SCRIPT, until, on_connected)))
+        await asyncio.sleep(ramp / max(1, n))
+    try:
+        await asyncio.wait_for(ready.wait(), max(1.0, until - time.monotonic()))
+        mem["connected_mb"] = rss_mb(pid) if pid else None
+    except asyncio.TimeoutError:
+        mem["connected_mb"] = None
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.monotonic() - t0
+    mem["end_mb"] = rss_mb(pid) if pid else None
+    errors = [repr(r) for r in results if isinstance(r, Exception)]
+    return stats, mem, elapsed, errors
+
+
+def report(stats, mem, elapsed, n, errors):
+    out = {"sessions": n, "seconds": round(elapsed, 1), "errors": len(errors), "steps": {}}
+    runs = 0
+    for kind, vals in sorted(stats.items()):
+        if kind in ("timeouts", "skipped"):
+            out[kind] = len(vals)
+            continue
+        runs += len(vals)
+        out["steps"][kind] = {"count": len(vals), "p50_ms": _pct(vals, .5), "p95_ms": _pct(vals, .95),
+                              "p99_ms": _pct(vals, .99), "mean_ms": round(statistics.mean(vals) * 1e3, 1)}
+    out["runs_per_s"] = round(runs / elapsed, 2) if elapsed else 0
+    out["memory"] = {k: round(v, 1) if v else v for k, v in mem.items()}
+    if mem.get("idle_mb") and mem.get("end_mb"):
+        out["memory"]["per_session_mb"] = round((mem["end_mb"] - mem["idle_mb"]) / n, 2)
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=10)
+    ap.add_argument("--duration", type=float, default=30.0, help="seconds of scripted activity")
+    ap.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions connect")
+    ap.add_argument("--query", default="", help="query string for every session, e.g. profile=alice")
+    ap.add_argument("--url", help="existing server (memory is not reported then, unless --pid)")
+    ap.add_argument("--pid", type=int, help="worker pid to sample RSS from with --url")
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args(argv)
+
+    proc = None
+    if args.url:
+        url, pid = args.url.rstrip("/"), args.pid
+    else:
+        proc, url = start_server(_free_port())
+        pid = proc.pid
+        time.sleep(1.0)
+    try:
+        stats, mem, elapsed, errors = asyncio.run(
+            _load(url, args.sessions, args.duration, args.query, args.ramp, pid))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(10)
+    out = report(stats, mem, elapsed, args.sessions, errors)
+    for kind, s in out["steps"].items():
+        print(f"{kind:9s} n={s['count']:<5d} p50={s['p50_ms']} ms  p95={s['p95_ms']} ms  p99={s['p99_ms']} ms")
+    print(f"throughput {out['runs_per_s']} runs/s over {out['seconds']} s, "
+          f"{out['errors']} session errors, {out.get('timeouts', 0)} timeouts, "
+          f"{out.get('skipped', 0)} skipped steps")
+    print("memory", json.dumps(out["memory"]))
+    for e in errors[:3]:
+        print("error:", e, file=sys.stderr)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
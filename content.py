@@ -0,0 +1,120 @@
+"""Process-wide cache of the dashboard content documents.
+
+Every Streamlit session in the worker shares one parsed copy per file. A rerun
+costs one ``os.stat``; the file is only re-read when its mtime/size change and
+only re-parsed when the bytes actually hash differently. Sessions get a
+read-only view (mappings -> ``MappingProxyType``, lists -> tuples) so nobody
+can mutate the shared tree or needs a private copy of it. At most
+``CACHE_SIZE`` documents stay parsed (least recently used are dropped).
+
+Each top-level section also gets its own digest. When a changed file is
+re-parsed, sections whose digest did not move keep their previous frozen
+object, and renderers key their caches on ``digests(path)[section]``, so
+editing ``growth`` leaves the timeline, matrix, ... served from cache.
+
+With ``PROMO_SNAPSHOTS=1`` a fresh ``.snap`` next to the JSON (see
+snapshot.py) is memory-mapped instead, and sections are decoded on first use.
+"""
+import hashlib, json, os, threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from lru import LRU
+
+CACHE_SIZE = int(os.environ.get("PROMO_CONTENT_CACHE", "256"))  # parsed documents kept per worker
+
+_lock = threading.Lock()
+_cache = LRU(CACHE_SIZE)   # abs path -> {"stat", "digest", "data": frozen, "sections": {name: sha256}}
+
+
+def freeze(obj):
+    if isinstance(obj, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(v) for v in obj)
+    return obj
+
+
+def thaw(obj):
+    """Plain dict/list copy of a frozen view (for json.dumps, pandas, ...)."""
+    if isinstance(obj, Mapping):
+        return {k: thaw(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(v) for v in obj]
+    return obj
+
+
+def slice_digest(obj):
+    """Stable sha256 of any (frozen or plain) JSON value."""
+    raw = json.dumps(thaw(obj), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _parse(raw, prev=None):
+    doc = json.loads(raw.decode("utf-8"))
+    if not isinstance(doc, Mapping):
+        return freeze(doc), MappingProxyType({})
+    old_data = prev["data"] if prev else {}
+    old_sections = prev["sections"] if prev else {}
+    data, sections = {}, {}
+    for name, value in doc.items():
+        sections[name] = d = slice_digest(value)
+        # unchanged slice: hand out the very same frozen object as before
+        data[name] = old_data[name] if old_sections.get(name) == d else freeze(value)
+    return MappingProxyType(data), MappingProxyType(sections)
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _entry(path):
+    path = os.path.abspath(path)
+    key = _stat_key(path)
+    hit = _cache.get(path)
+    if hit and hit["stat"] == key:
+        return hit
+    with _lock:
+        hit = _cache.get(path)
+        if hit and hit["stat"] == key:
+            return hit
+        snap = _snapshot(path, key)
+        if snap is not None:
+            data, sections = snap
+            return _cache.put(path, {"stat": key, "digest": data.source_digest, "data": data, "sections": sections})
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if hit and hit["digest"] == digest:
+            # touched but unchanged (e.g. editor save without edits): keep the parsed tree
+            hit = dict(hit, stat=key)
+        else:
+            data, sections = _parse(raw, hit)
+            hit = {"stat": key, "digest": digest, "data": data, "sections": sections}
+        return _cache.put(path, hit)
+
+
+def _snapshot(path, key):
+    import snapshot  # imports this module
+
+    return snapshot.open_for(path, key) if snapshot.ENABLED else None
+
+
+def load(path):
+    """Shared, read-only content for ``path``; re-parsed only when the file changes."""
+    return _entry(path)["data"]
+
+
+def digest(path):
+    """sha256 of the currently cached bytes of ``path`` (usable as a cache key)."""
+    return _entry(path)["digest"]
+
+
+def digests(path):
+    """{section: sha256 of just that section} for the current version of ``path``."""
+    return _entry(path)["sections"]
+
+
+def clear():
+    _cache.clear()
@@ -0,0 +1,137 @@
+"""Downloadable summaries, built off the render thread and cached by content hash.
+
+Two artifacts per content version:
+
+  markdown    the promotion summary (quick stats + matrix) as a .md file
+  html        the whole page as one print-ready HTML file (``export.page``
+              with images inlined, every details block open and both tabs
+              shown when printed) -- "Save as PDF" from the browser's print
+              dialog turns it into the PDF
+
+``status(kind, C, key, slug)`` returns the bytes when they are ready and
+otherwise starts (or joins) the build in the ``background`` pool, so the
+Download tab never builds anything itself; a build that raised is logged and
+reported as failed for that content version rather than retried per rerun. ``prepare`` starts
+every artifact; app.py calls it once per content version. Artifacts live in
+an LRU and, with ``shared`` enabled, in the host-wide disk tier.
+"""
+import hashlib, json, logging, sys
+from datetime import date
+
+import assets
+import background
+import shared
+from lru import LRU
+
+KINDS = {
+    # kind -> (label, file name, mime)
+    "markdown": ("Markdown summary", "promotion_summary.md", "text/markdown"),
+    "html": ("print-ready page (HTML → PDF)", "promotion_summary.html", "text/html"),
+}
+PRINT_STYLE = """
+<style>
+@page { margin: 14mm; }
+@media print {
+  body, .block-container { background:#fff; }
+  .tabs > input, .tabs > label { display:none; }
+  .tabs > .tab { display:block !important; }
+  section, details, .hero { break-inside: avoid; }
+  summary { display:none; }
+  details { border:0; padding:0; }
+}
+</style>
+"""
+
+log = logging.getLogger("promo.downloads")
+_artifacts = LRU(64, max_bytes=64 << 20)
+_failed = LRU(256)           # cache key -> error message
+
+
+def key(digests):
+    """Content version of a whole document, from its per-section digests."""
+    return hashlib.sha256(json.dumps(sorted(digests.items())).encode()).hexdigest()
+
+
+def markdown(C):
+    md = [f"# Promotion Summary — {C.get('name','')}", "", f"> {C.get('summary','')}", ""]
+    if "metrics" in C:
+        md += ["## Quick Stats"] + [f"- **{n}** {lbl}" for n, lbl in C["metrics"]] + [""]
+    if "matrix" in C:
+        md += ["## Promotion Matrix"]
+        for k, v in C["matrix"].items():
+            md.append(f"### {k}")
+            for item in v:
+                s = str(item).strip()
+                md.append(f"**{s}**" if s.endswith(":") else f"- {s}")
+            md.append("")
+    return "\n".join(md)
+
+
+def print_html(C, slug=""):
+    import export  # only this artifact needs the page builder
+    assets.ensure_built()
+    text, used = export.page(C, slug, date.today())
+    for variant in used:  # one self-contained file: images go inline
+        text = text.replace(export._asset_url(variant, set()), assets.data_url(variant) or "")
+    text = text.replace("<details>", "<details open>")
+    return text.replace("</head>", PRINT_STYLE + "</head>", 1)
+
+
+BUILDERS = {"markdown": markdown, "html": print_html}
+
+
+def _cache_key(kind, C, content_key, slug):
+    code = shared.code_version(sys.modules[__name__])
+    if kind != "html":
+        return f"{kind}-{code}-{content_key}"
+    # the html inlines this profile's images (variant names are content hashes) and
+    # embeds the timeline, whose open-ended ranges run to today
+    import export
+    photo, logos = export.images(C, slug)
+    images = hashlib.sha256(json.dumps([photo, sorted(logos.items())]).encode()).hexdigest()[:16]
+    return f"{kind}-{code}-{date.today().isoformat()}-{slug or 'default'}-{images}-{content_key}"
+
+
+def _build(kind, ck, C, slug):
+    try:
+        text = shared.get("downloads", ck)
+        if text is None:
+            args = (C, slug) if kind == "html" else (C,)
+            text = shared.put("downloads", ck, BUILDERS[kind](*args))
+    except Exception as e:
+        log.exception("download %s failed (%s)", kind, ck)
+        _failed.put(ck, f"{type(e).__name__}: {e}")
+        raise
+    return _artifacts.put(ck, text.encode("utf-8"))
+
+
+def status(kind, C, content_key, slug=""):
+    """("ready", bytes), ("building", None) or ("failed", message); starts the
+    build when it is neither cached nor in flight. A failure is kept per content
+    version, so it is reported once instead of retried on every rerun."""
+    if kind == "html" and not assets.ready():
+        background.once("assets", assets.ensure_built)  # the key needs the resolved images
+        return "building", None
+    ck = _cache_key(kind, C, content_key, slug)
+    hit = _artifacts.get(ck)
+    if hit is not None:
+        return "ready", hit
+    err = _failed.get(ck)
+    if err is not None:
+        return "failed", err
+    fut = background.once(("download", ck), _build, kind, ck, C, slug)
+    if fut.done():
+        return ("failed", _failed.get(ck, "build failed")) if fut.exception() else ("ready", fut.result())
+    return "building", None
+
+
+def get(kind, C, content_key, slug=""):
+    """Bytes of one artifact, or None while it is being built (or if it failed)."""
+    state, value = status(kind, C, content_key, slug)
+    return value if state == "ready" else None
+
+
+def prepare(C, content_key, slug=""):
+    """Start every artifact of this content version (no-op once they are built)."""
+    for kind in KINDS:
+        get(kind, C, content_key, slug)
@@ -0,0 +1,268 @@
+"""Static site export: the dashboard as plain HTML, batch-built and incremental.
+
+    python export.py                          # default document + every profile -> dist/
+    python export.py --jobs 8 --out site      # process pool of 8
+    python export.py data/profiles/alice.json --force
+
+Each profile becomes ``<out>/<slug>/index.html``: hero, intro, the Journey
+timeline as an embedded Vega-Lite spec (vega-embed from a CDN), highlights,
+KPI Deep-Dives with collapsible details, achievements and the Feedback /
+Growth tabs (pure CSS). Images are copied once into ``<out>/assets`` under
+their content-hashed variant names, so any static file server can cache them
+forever. The markup comes from the same ``render`` builders the app uses.
+
+A profile is rebuilt only when its fingerprint moves: content bytes, the
+image variants it references, the exporting code, and today's date when a
+timeline range is open-ended. ``<out>/<slug>/.build`` holds the last one.
+"""
+import argparse, hashlib, html, json, os, shutil, sys, time
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import assets
+import content
+import profiles
+import render
+import shared
+import timeline
+
+OUT_DIR = "dist"
+DEFAULT_SLUG = "default"
+STAMP = ".build"
+VEGA = ["https://cdn.jsdelivr.net/npm/vega@5",
+        "https://cdn.jsdelivr.net/npm/vega-lite@5",
+        "https://cdn.jsdelivr.net/npm/vega-embed@6"]
+STATIC_PREFIX = "app/static/assets/"
+
+# layout the Streamlit page gets from its own components (columns, tabs, expanders)
+EXPORT_STYLE = """
+<style>
+body { margin:0; font-family: "Source Sans Pro", system-ui, sans-serif; color:#1f2937; }
+.block-container { margin:0 auto; padding:32px 24px 64px; }
+.intro-wrap { display:grid; grid-template-columns:1fr 1.6fr; gap:32px; margin:24px 0; }
+.intro-wrap img { width:100%; border-radius:12px; }
+.cols { display:grid; grid-template-columns:repeat(auto-fit, minmax(260px, 1fr)); gap:16px; }
+section { margin:32px 0; }
+details { border:1px solid #e5e7eb; border-radius:8px; padding:6px 12px; margin:6px 0 12px; }
+summary { cursor:pointer; font-weight:600; }
+.caption { color:#6b7280; font-size:14px; }
+.tabs > input { display:none; }
+.tabs > label { display:inline-block; font-size:28px; font-weight:700; color:#475569; margin-right:24px; cursor:pointer; }
+.tabs > input:checked + label { color:#1f2937; }
+.tabs > .tab { display:none; margin-top:16px; }
+#tab-feedback:checked ~ .tab-feedback, #tab-growth:checked ~ .tab-growth { display:block; }
+</style>
+"""
+
+
+def _asset_url(variant, used):
+    used.add(variant)
+    return "../assets/" + os.path.basename(variant)
+
+
+def _relink(node, used):
+    # static-route image URLs in the spec -> files next to the page
+    if isinstance(node, dict):
+        return {k: _relink(v, used) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_relink(v, used) for v in node]
+    if isinstance(node, str) and node.startswith(STATIC_PREFIX):
+        return _asset_url(os.path.join(assets.CACHE_DIR, node[len(STATIC_PREFIX):]), used)
+    return node
+
+
+def images(C, slug):
+    """The variants a page references: intro photo and timeline logos."""
+    intro = C.get("intro", {})
+    photo = (assets.find(intro["photo"], slug) if intro.get("photo")
+             else next(iter(assets.by_role("photo", slug)), None))
+    logo_files = C.get("logos", {})
+    logos = {org: assets.find(logo_files.get(org, org), slug) for org in timeline.orgs(C.get("timeline_ranges", []))}
+    return photo, {org: v for org, v in logos.items() if v}
+
+
+def fingerprint(path, slug, today):
+    C = content.load(path)
+    photo, logos = images(C, slug)
+    open_ended = any(not r.get("end") for r in C.get("timeline_ranges", []))
+    payload = [content.digest(path), photo, sorted(logos.items()),
+               [shared.code_version(m) for m in (sys.modules[__name__], render, timeline, assets)],
+               today.isoformat() if open_ended else None]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def page(C, slug, today):
+    """(html, set of variant paths it references)."""
+    used = set()
+    photo, logos = images(C, slug)
+    intro = C.get("intro", {})
+    title = intro.get("title") or (f"Hi, I am {C['name']}!" if C.get("name") else "Hi!")
+    out = [f"<!doctype html><html lang='en'><head><meta charset='utf-8'>",
+           f"<meta name='viewport' content='width=device-width, initial-scale=1'>",
+           f"<title>Promotion Summary — {html.escape(str(C.get('name', slug)))}</title>",
+           *(f"<script src='{u}'></script>" for u in VEGA),
+           render.STYLE, EXPORT_STYLE, "</head><body><div class='block-container'>",
+           render.hero(C.get("summary", ""))]
+
+    # intro
+    out.append("<div class='intro-wrap'><div>")
+    if photo:
+        out.append(f"<img src='{_asset_url(photo, used)}' alt=''>")
+    out.append(f"</div><div><h1>{title}</h1>")
+    if intro.get("lead"):
+        out.append(f"<div class='intro-lead'>{intro['lead']}</div>")
+    out.append(f"<div class='intro-bullets'>{render.to_html(render.bullets(intro.get('bullets', [])))}</div></div></div>")
+
+    # journey timeline
+    out.append("<section>" + render.section_title("Journey at Mantel"))
+    ranges = C.get("timeline_ranges", [])
+    if ranges:
+        spec = _relink(timeline.compiled_spec(ranges, logos, today=today), used)
+        out.append("<div id='timeline'></div><script>vegaEmbed('#timeline', "
+                   + json.dumps(spec).replace("</", "<\\/") + ", {actions: false});</script>")
+    out.append("</section>")
+
+    # highlights
+    out.append("<section>" + render.section_title("Highlights") + "<div class='cols'>")
+    out += [f"<div>{render.to_html(h)}</div>" for h in render.highlights(C.get("highlights", []))]
+    out.append("</div></section>")
+
+    # KPI deep-dives
+    out.append("<section>" + render.section_title("KPI Deep-Dives"))
+    color = None
+    matrix = C.get("matrix", {})
+    for name, header, color in render.kpi_blocks(matrix):
+        out.append(render.to_html(header))
+        out.append(f"<details><summary>Details</summary>{render.to_html(render.grouped(matrix[name]))}</details>")
+    if color:
+        out.append(render.kpi_rule(color))
+    out.append("</section>")
+
+    # achievements + first testimonial
+    ach = render.achievements(C.get("achievements", []))
+    if ach:
+        out.append("<section>" + render.section_title("Certifications & Achievements") + "<div class='cols'>")
+        out += [f"<div>{render.to_html(line)}" + (f"<div class='caption'>{note}</div>" if note else "") + "</div>"
+                for line, note in ach]
+        out.append("</div>")
+        fs = C.get("feedback_section", {})
+        tlist = fs.get("testimonials", []) if isinstance(fs, Mapping) else []
+        if tlist:
+            t = tlist[0]
+            who = " — ".join([x for x in [t.get("name"), t.get("org")] if x])
+            out.append(render.to_html(f"*What clients say*\n\n> “{t.get('quote','')}” — **{who}**"))
+        out.append("</section>")
+
+    # feedback + growth tabs
+    quotes, cards = render.feedback(C.get("feedback_section", {}))
+    out.append("<section class='tabs'>"
+               "<input type='radio' name='tabs' id='tab-feedback' checked><label for='tab-feedback'>📋 Feedback</label>"
+               "<input type='radio' name='tabs' id='tab-growth'><label for='tab-growth'>📈 Growth Plan</label>"
+               "<div class='tab tab-feedback'>" + render.section_title("What people say 🗣️"))
+    out.append(render.to_html(quotes) if quotes else "<p class='caption'>No feedback quotes available yet.</p>")
+    out.append(render.SPACER + render.section_title("Incorporating Feedback 💬 + 🔄"))
+    for card, ev in cards:
+        out.append(render.to_html(card))
+        if ev:
+            out.append(f"<details><summary>Evidence</summary>{render.to_html(ev)}</details>")
+    out.append("</div><div class='tab tab-growth'>" + render.section_title("Growth Plan 📈")
+               + render.to_html(render.bullets(C.get("growth", []))) + "</div></section>")
+
+    out.append("</div></body></html>")
+    return "\n".join(out), used
+
+
+def _write(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def build_one(job):
+    """Worker: (path, name, scope, out_dir, force) -> (name, "built" | "fresh" | "failed", seconds).
+    ``name`` is the output directory, ``scope`` the asset scope ("" for the default
+    document). One broken profile is reported, not allowed to abort the batch."""
+    t0 = time.perf_counter()
+    try:
+        status = _build_one(*job)
+    except Exception as e:
+        print(f"export: {job[1]}: {type(e).__name__}: {e}", file=sys.stderr)
+        status = "failed"
+    return job[1], status, time.perf_counter() - t0
+
+
+def _build_one(path, name, scope, out_dir, force):
+    if not assets.ready():
+        assets.load_index()  # the parent built the variants
+    today = date.today()
+    key = fingerprint(path, scope, today)
+    dest = os.path.join(out_dir, name)
+    stamp = os.path.join(dest, STAMP)
+    if not force:
+        try:
+            with open(stamp, "r", encoding="utf-8") as f:
+                if f.read().strip() == key:
+                    return "fresh"
+        except OSError:
+            pass
+    text, used = page(content.load(path), scope, today)
+    os.makedirs(dest, exist_ok=True)
+    asset_dir = os.path.join(out_dir, "assets")
+    os.makedirs(asset_dir, exist_ok=True)
+    for variant in used:
+        target = os.path.join(asset_dir, os.path.basename(variant))
+        if not os.path.exists(target):  # hashed names: same name, same bytes
+            shutil.copyfile(variant, target + f".{os.getpid()}.tmp")
+            os.replace(target + f".{os.getpid()}.tmp", target)
+    _write(os.path.join(dest, "index.html"), text)
+    _write(stamp, key)
+    return "built"
+
+
+def jobs_for(paths):
+    """(content path, output name, asset scope) per page. The default document
+    is written to ``default/`` but uses the shared assets (scope ""), like the app."""
+    if not paths:
+        return [(profiles.content_path(""), DEFAULT_SLUG, "")] + sorted((p, s, s) for s, p in profiles.index().items())
+    root = os.path.abspath(profiles.PROFILES_DIR)
+    out = []
+    for p in paths:
+        name = os.path.splitext(os.path.basename(p))[0]
+        out.append((p, name, name if os.path.dirname(os.path.abspath(p)) == root else ""))
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("content", nargs="*", help="content files (default: default document + every profile)")
+    ap.add_argument("--out", default=OUT_DIR)
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--force", action="store_true", help="rebuild even if nothing changed")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    assets.ensure_built()  # once, here: workers only read the manifest
+    jobs = [(p, name, scope, args.out, args.force) for p, name, scope in jobs_for(args.content)]
+    if args.jobs > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(build_one, jobs, chunksize=max(1, len(jobs) // (args.jobs * 4))))
+    else:
+        results = [build_one(j) for j in jobs]
+    for slug, status, dt in results:
+        print(f"{slug:32s} {status:6s} {dt * 1e3:8.1f} ms")
+
+    # a failed profile keeps its last good page, if it ever had one
+    links = "".join(f"<li><a href='{s}/index.html'>{html.escape(s)}</a></li>"
+                    for s, _, _ in results if os.path.exists(os.path.join(args.out, s, "index.html")))
+    _write(os.path.join(args.out, "index.html"),
+           f"<!doctype html><meta charset='utf-8'><title>Promotion Summaries</title><ul>{links}</ul>")
+    counts = {k: sum(1 for _, status, _ in results if status == k) for k in ("built", "fresh", "failed")}
+    print(f"{counts['built']} built, {counts['fresh']} unchanged, {counts['failed']} failed "
+          f"in {time.perf_counter() - t0:.1f} s -> {args.out}")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Small thread-safe LRU used by every process-wide cache.
+
+Bounded by entry count and, optionally, by total size (``sizeof(value)``), so
+memory stays flat however many profiles a worker has served.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRU:
+    def __init__(self, maxsize=128, max_bytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._data = OrderedDict()   # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None:
+                return default
+            self._data.move_to_end(key)
+            return hit[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.max_bytes else 0
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._data[key] = (value, size)
+            self.bytes += size
+            while len(self._data) > self.maxsize or (self.max_bytes and self.bytes > self.max_bytes and len(self._data) > 1):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.bytes -= evicted
+        return value
+
+    def pop(self, key, default=None):
+        with self._lock:
+            hit = self._data.pop(key, None)
+            if hit is None:
+                return default
+            self.bytes -= hit[1]
+            return hit[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,178 @@
+"""Section timing: startup profile and rolling production metrics.
+
+Two switches, both off by default:
+
+``PROMO_PROFILE=1``
+    each heavy module import and the first render of each named section in the
+    worker process are logged to the ``promo.perf`` logger (stderr); ``report()``
+    collects them for the ``?debug=metrics`` sidebar.
+``PROMO_METRICS=1``
+    every section timing goes into a rolling in-process window (last
+    ``WINDOW`` samples per section) summarised as p50/p95/p99. With
+    ``PROMO_METRICS_FILE`` set, a daemon thread rewrites that file every
+    ``EXPORT_EVERY`` seconds -- JSON if it ends in ``.json``, Prometheus text
+    otherwise. Pointing it under ``static/`` makes it scrapeable at
+    ``app/static/...``; ``?debug=metrics`` shows the table in the sidebar.
+
+Disabled, ``section()`` hands back a shared no-op context manager, so
+instrumented code pays one attribute lookup and a call.
+
+Cold-start import profile of the dashboard's dependencies, in a fresh
+interpreter:
+
+    python perf.py
+"""
+import importlib, json, logging, os, subprocess, sys, threading, time
+from collections import deque
+from contextlib import nullcontext
+
+PROFILE = os.environ.get("PROMO_PROFILE") == "1"
+METRICS = os.environ.get("PROMO_METRICS") == "1"
+ENABLED = PROFILE or METRICS
+METRICS_FILE = os.environ.get("PROMO_METRICS_FILE")
+WINDOW = 1024
+EXPORT_EVERY = 10.0
+HEAVY = ["streamlit", "pandas", "altair", "PIL.Image"]
+
+log = logging.getLogger("promo.perf")
+if PROFILE and not log.handlers:
+    log.addHandler(logging.StreamHandler())
+    log.setLevel(logging.INFO)
+_lock = threading.Lock()
+_imports = {}        # module -> seconds spent importing it here
+_first_render = {}   # section -> seconds of its first render in this process
+_samples = {}        # section -> deque of recent durations (seconds)
+_totals = {}         # section -> [count, sum] since process start
+_exporter = None
+_NULL = nullcontext()
+_import_lock = threading.Lock()
+_imported = set()   # modules lazy_import has seen fully initialised
+
+
+def lazy_import(name):
+    """``importlib.import_module`` that records what the first import cost."""
+    if name in _imported:
+        return sys.modules[name]
+    # serialised: sys.modules already holds a module another thread is still
+    # initialising, so two first imports racing could see half a module
+    with _import_lock:
+        t0 = time.perf_counter()
+        mod = importlib.import_module(name)
+        _imported.add(name)
+    if PROFILE:
+        dt = time.perf_counter() - t0
+        with _lock:
+            _imports.setdefault(name, dt)
+        log.info("import %-10s %7.1f ms (%s)", name, dt * 1e3, threading.current_thread().name)
+    return mod
+
+
+def record(name, dt):
+    with _lock:
+        first = name not in _first_render
+        if first:
+            _first_render[name] = dt
+        if METRICS:
+            _samples.setdefault(name, deque(maxlen=WINDOW)).append(dt)
+            tot = _totals.setdefault(name, [0, 0.0])
+            tot[0] += 1; tot[1] += dt
+    if first and PROFILE:
+        log.info("first render %-16s %7.1f ms", name, dt * 1e3)
+    if METRICS and METRICS_FILE and _exporter is None:
+        _start_exporter()
+
+
+class _Section:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.t0)
+
+
+def section(name):
+    return _Section(name) if ENABLED else _NULL
+
+
+def _quantile(sorted_vals, q):
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+def snapshot():
+    """{section: {count, sum_s, p50_ms, p95_ms, p99_ms}} over the rolling window."""
+    with _lock:
+        items = [(k, sorted(v), tuple(_totals[k])) for k, v in _samples.items()]
+    out = {}
+    for name, vals, (count, total) in sorted(items):
+        out[name] = {"count": count, "sum_s": round(total, 6),
+                     **{f"p{int(q*100)}_ms": round(_quantile(vals, q) * 1e3, 3) for q in (.5, .95, .99)}}
+    return out
+
+
+def prometheus(snap=None):
+    snap = snapshot() if snap is None else snap
+    lines = ["# HELP promo_section_seconds Render time of a dashboard section.",
+             "# TYPE promo_section_seconds summary"]
+    for name, m in snap.items():
+        for q in ("50", "95", "99"):
+            lines.append(f'promo_section_seconds{{section="{name}",quantile="0.{q}"}} {m[f"p{q}_ms"] / 1e3:.6f}')
+        lines.append(f'promo_section_seconds_sum{{section="{name}"}} {m["sum_s"]:.6f}')
+        lines.append(f'promo_section_seconds_count{{section="{name}"}} {m["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    path = path or METRICS_FILE
+    snap = snapshot()
+    body = json.dumps(snap, indent=2) if path.endswith(".json") else prometheus(snap)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+
+def _start_exporter():
+    global _exporter
+    with _lock:
+        if _exporter is not None:
+            return
+        def loop():
+            while True:
+                time.sleep(EXPORT_EVERY)
+                try:
+                    export()
+                except OSError as e:
+                    log.warning("metrics export to %s failed: %s", METRICS_FILE, e)
+        _exporter = threading.Thread(target=loop, name="promo-metrics", daemon=True)
+        _exporter.start()
+
+
+def report():
+    """Startup profile of this worker: first import and first render times (ms)."""
+    with _lock:
+        return {"imports_ms": {k: round(v * 1e3, 1) for k, v in _imports.items()},
+                "first_render_ms": {k: round(v * 1e3, 1) for k, v in _first_render.items()}}
+
+
+def import_profile(modules=HEAVY):
+    """Cumulative cold import time (ms) of each module, measured with -X importtime."""
+    out = {}
+    for name in modules:
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {name}"],
+                              capture_output=True, text=True)
+        for line in proc.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == name:
+                out[name] = int(parts[1]) / 1e3
+    return out
+
+
+if __name__ == "__main__":
+    for name, ms in import_profile().items():
+        print(f"{name:10s} {ms:8.1f} ms")
@@ -0,0 +1,68 @@
+"""Profile index: which people this deployment serves and where their files are.
+
+Layout (``PROMO_PROFILES_DIR``, default ``data/profiles``)::
+
+    data/profiles/<slug>.json          content document, same schema as data/content.json
+    data/profiles/<slug>/assets/...    optional per-person images (intro photo, logos)
+
+``?profile=<slug>`` selects a profile; without it the legacy single-person
+document (``PROMO_CONTENT``, default data/content.json) is served. The index
+is built once per process by listing the directory, so an unknown slug is
+rejected from memory without touching disk; ``refresh()`` rebuilds it.
+"""
+import os, re, threading
+
+PROFILES_DIR = os.environ.get("PROMO_PROFILES_DIR", "data/profiles")
+DEFAULT_CONTENT = os.environ.get("PROMO_CONTENT", "data/content.json")
+SHARED_ASSET_DIRS = ["assets", "data/assets"]
+SLUG = re.compile(r"^[a-z0-9][a-z0-9_-]{0,63}$")
+
+_lock = threading.Lock()
+_index = None        # slug -> content path
+
+
+def build_index(root=None):
+    root = root or PROFILES_DIR
+    out = {}
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return out
+    for e in entries:
+        slug, ext = os.path.splitext(e.name)
+        if ext == ".json" and SLUG.match(slug) and e.is_file():
+            out[slug] = e.path
+    return out
+
+
+def refresh():
+    global _index
+    idx = build_index()
+    with _lock:
+        _index = idx
+    return idx
+
+
+def index():
+    return _index if _index is not None else refresh()
+
+
+def content_path(slug):
+    """Content file for ``slug`` (default document for an empty slug), None if unknown."""
+    if not slug:
+        return os.environ.get("PROMO_CONTENT", DEFAULT_CONTENT)  # read per call: the benchmark switches it between runs
+    if not SLUG.match(slug):
+        return None
+    return index().get(slug)
+
+
+def asset_dirs(slug):
+    """Where to look for this profile's images, most specific first."""
+    own = [os.path.join(PROFILES_DIR, slug, "assets")] if slug else []
+    return own + SHARED_ASSET_DIRS
+
+
+def profile_asset_dirs():
+    """Every per-profile asset directory (for the asset build)."""
+    return [os.path.join(PROFILES_DIR, slug, "assets") for slug in sorted(index())
+            if os.path.isdir(os.path.join(PROFILES_DIR, slug, "assets"))]
@@ -0,0 +1,241 @@
+"""Remote content source: mirror profiles from an HTTP content service.
+
+With ``PROMO_CONTENT_URL`` set, one background thread per process polls
+
+    <url>/index.json                  JSON list of profile slugs
+    <url>/<slug>.json                 one profile ("default" is the default document)
+    <url>/<slug>/assets/<name>        images the profile references (intro photo, logos)
+
+over a pooled keep-alive urllib3 client and mirrors them into the local
+layout the rest of the app already reads: the default document at
+``PROMO_CONTENT``, profiles under ``PROMO_PROFILES_DIR`` (assets in
+``<slug>/assets``, the default document's in ``data/assets``). Every request
+is conditional (``If-None-Match`` / ``If-Modified-Since`` from the last
+response; validators are kept in ``.remote.json`` so a restart stays
+conditional): a 304 costs no body and no disk write. A 200 whose body hashes
+the same as the local copy is not written either, so content and asset
+caches are only invalidated when something really changed; changed files
+are handed to ``watcher`` which re-parses them and reloads open sessions.
+
+A slow or failing service never blocks a render: the mirror simply keeps the
+last good copy, and polling backs off up to ``MAX_BACKOFF``. Only the very
+first start with nothing mirrored yet waits for one sync.
+
+``PROMO_CONTENT_POLL`` sets the interval (seconds). urllib3 is only needed
+when a URL is configured.
+"""
+import hashlib, json, logging, os, threading, time
+
+import profiles
+import watcher
+
+URL = os.environ.get("PROMO_CONTENT_URL", "").rstrip("/")
+ENABLED = bool(URL)
+POLL_EVERY = float(os.environ.get("PROMO_CONTENT_POLL", "30"))
+MAX_BACKOFF = 300.0
+TIMEOUT = (2.0, 10.0)        # connect, read (seconds)
+DEFAULT_SLUG = "default"
+STATE = ".remote.json"       # per-URL validators, next to the mirrored profiles
+
+log = logging.getLogger("promo.remote")
+_lock = threading.Lock()
+_http = None
+_validators = None           # url -> {"etag": ..., "last_modified": ...}
+_started = False
+_last_ok = None              # wall time of the last complete sync
+
+
+def _client():
+    global _http
+    if _http is None:
+        import urllib3
+        _http = urllib3.PoolManager(num_pools=4, maxsize=4, retries=False,
+                                    timeout=urllib3.Timeout(connect=TIMEOUT[0], read=TIMEOUT[1]))
+    return _http
+
+
+def _state_path():
+    return os.path.join(profiles.PROFILES_DIR, STATE)
+
+
+def _load_validators():
+    global _validators
+    if _validators is None:
+        try:
+            with open(_state_path(), "r", encoding="utf-8") as f:
+                _validators = json.load(f)
+        except (OSError, ValueError):
+            _validators = {}
+    return _validators
+
+
+def _save_validators():
+    os.makedirs(profiles.PROFILES_DIR, exist_ok=True)
+    tmp = f"{_state_path()}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_validators, f, indent=1, sort_keys=True)
+    os.replace(tmp, _state_path())
+
+
+def fetch(url):
+    """Body of ``url`` if it changed since the last fetch, None on 304.
+
+    Raises OSError on network errors and unexpected statuses."""
+    import urllib3
+    seen = _load_validators().get(url, {})
+    headers = {}
+    if seen.get("etag"):
+        headers["If-None-Match"] = seen["etag"]
+    if seen.get("last_modified"):
+        headers["If-Modified-Since"] = seen["last_modified"]
+    try:
+        r = _client().request("GET", url, headers=headers, preload_content=True)
+    except urllib3.exceptions.HTTPError as e:
+        raise OSError(f"{url}: {e}") from e
+    if r.status == 304:
+        return None
+    if r.status != 200:
+        raise OSError(f"{url}: HTTP {r.status}")
+    _validators[url] = {k: v for k, v in (("etag", r.headers.get("ETag")),
+                                           ("last_modified", r.headers.get("Last-Modified"))) if v}
+    return r.data
+
+
+def _write_if_changed(path, data):
+    """Replace ``path`` atomically unless it already holds ``data``; True if written."""
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def local_path(slug):
+    if slug == DEFAULT_SLUG:
+        return profiles.content_path("")
+    return os.path.join(profiles.PROFILES_DIR, f"{slug}.json")
+
+
+def asset_dir(slug):
+    if slug == DEFAULT_SLUG:
+        return profiles.SHARED_ASSET_DIRS[-1]
+    return os.path.join(profiles.PROFILES_DIR, slug, "assets")
+
+
+def referenced_assets(doc):
+    """Image names a document points at (intro photo, timeline logos)."""
+    names = [(doc.get("intro") or {}).get("photo")] + list((doc.get("logos") or {}).values())
+    return sorted({n for n in names if n and os.path.basename(n) == n and not n.startswith(".")})
+
+
+def slugs():
+    """Slugs the service lists (mirrored ones when the index is unchanged or unreachable)."""
+    body = fetch(f"{URL}/index.json")
+    if body is None:
+        return [DEFAULT_SLUG] + sorted(profiles.index())
+    listed = [s for s in json.loads(body) if isinstance(s, str) and profiles.SLUG.match(s)]
+    return [DEFAULT_SLUG] + sorted(set(listed) - {DEFAULT_SLUG})
+
+
+def sync_one(slug):
+    """Mirror one profile and its images; paths written (empty when nothing changed)."""
+    changed = []
+    path = local_path(slug)
+    url = f"{URL}/{slug}.json"
+    body = fetch(url)
+    if body is not None:
+        try:
+            doc = json.loads(body)  # a half-published document must not replace the last good one
+        except ValueError:
+            _validators.pop(url, None)  # and must not be skipped as "not modified" next time
+            raise
+        if _write_if_changed(path, body):
+            changed.append(path)
+    elif not os.path.exists(path):
+        # validators without a local copy (deleted by hand): fetch unconditionally
+        _validators.pop(url, None)
+        return sync_one(slug)
+    else:
+        with open(path, "rb") as f:
+            doc = json.loads(f.read())
+    for name in referenced_assets(doc):
+        target = os.path.join(asset_dir(slug), name)
+        url = f"{URL}/{slug}/assets/{name}"
+        if not os.path.exists(target):
+            _validators.pop(url, None)
+        try:
+            data = fetch(url)
+        except OSError as e:  # a missing image must not hold back the document
+            log.warning("asset %s: %s", name, e)
+            continue
+        if data is not None and _write_if_changed(target, data):
+            changed.append(target)
+    return changed
+
+
+def sync():
+    """One pass over every listed profile; paths that changed. Raises OSError if
+    the service is unreachable (nothing is changed then)."""
+    global _last_ok
+    changed, failed = [], 0
+    with _lock:
+        saved = json.loads(json.dumps(_load_validators()))
+        for slug in slugs():
+            try:
+                changed += sync_one(slug)
+            except (OSError, ValueError) as e:  # keep the last good copy of this one
+                failed += 1
+                log.warning("profile %s: %s", slug, e)
+        if _validators != saved:
+            _save_validators()
+    if not failed:
+        _last_ok = time.time()
+    if changed:
+        if any(p.endswith(".json") for p in changed):
+            profiles.refresh()  # new slugs are servable right away
+        for p in changed:
+            watcher.notify(p)
+        log.info("mirrored %d changed file(s) from %s", len(changed), URL)
+    return changed
+
+
+def last_ok():
+    """Wall time of the last sync where every profile came through (None if never)."""
+    return _last_ok
+
+
+def _poll_loop():
+    delay = POLL_EVERY
+    while True:
+        time.sleep(delay)
+        try:
+            sync()
+            delay = POLL_EVERY
+        except (OSError, ValueError) as e:
+            delay = min(MAX_BACKOFF, delay * 2)
+            log.warning("content service unavailable (%s); serving the last good copy, retry in %.0fs", e, delay)
+
+
+def start():
+    """Start polling once per process (no-op without ``PROMO_CONTENT_URL``)."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    if not os.path.exists(local_path(DEFAULT_SLUG)):
+        # first start: nothing to fall back on yet, so wait for one pass
+        try:
+            sync()
+        except (OSError, ValueError) as e:
+            log.warning("initial sync from %s failed: %s", URL, e)
+    threading.Thread(target=_poll_loop, name="promo-remote", daemon=True).start()
@@ -0,0 +1,358 @@
+"""Pre-rendered markdown/HTML blocks for the dashboard sections.
+
+Each function returns one string that app.py emits with a single
+``st.markdown`` call, so the number of elements (websocket deltas) per rerun
+grows with the number of sections rather than the number of bullets. Pure
+functions of the content: no Streamlit imports here.
+
+``cached(fn, digest, value)`` memoises a whole section's blocks on the digest
+of just its content slice (``content.digests``), so an edit to one section
+leaves the others' markup served from cache (and, with ``shared``
+enabled, from the host-wide disk tier other workers already filled).
+
+Long lists (KPI bullets, quotes, improvement cards, growth plan) are built
+one window of ``PAGE`` items at a time by the ``*_page`` builders, which take
+``(items, lo)``: a rerun only builds and sends the windows a viewer opened.
+"""
+import os, re, sys
+from collections.abc import Mapping
+
+import content
+import shared
+from lru import LRU
+
+_blocks = LRU(int(os.environ.get("PROMO_RENDER_CACHE", "1024")))  # (builder, slice digest) -> blocks
+PAGE = int(os.environ.get("PROMO_PAGE_SIZE", "25"))                # items per "show more" window
+
+SECTION_ICONS = {
+    "Overview":"📌","Relationship Building":"🤝","Problem Solving":"🧩",
+    "Communication":"🗣️","Commercial Craft":"💼","Data & AI SME Expertise":"🧠"
+}
+SECTION_COLORS = {
+    "Overview":"#0ea5e9","Relationship Building":"#22c55e","Problem Solving":"#6366f1",
+    "Communication":"#f59e0b","Commercial Craft":"#ec4899","Data & AI SME Expertise":"#14b8a6"
+}
+SPACER = "<div style='height:1rem'></div>"  # what a bare st.write("") used to add
+
+# page styles (shared by app.py and the static export)
+STYLE = """
+<style>
+/* overall bg */
+body { background-color: #FCFBF7; }
+.block-container { max-width: 1200px; background-color: #FCFBF7; }
+
+/* hero + section headings */
+.hero { padding:22px 26px; border-radius:18px;
+        background:linear-gradient(135deg,#4F46E520,#06B6D420);
+        border:1px solid #e5e7eb; }
+.section-title { font-size:20px; font-weight:700; margin:0 0 8px 0; }
+.divider-dark { height:3px; background:#1f2937; opacity:.1; border-radius:999px; }
+
+/* chips + tags */
+.pill { display:inline-flex; align-items:center; gap:6px; padding:6px 12px;
+       border-radius:999px; background:#4F46E515; color:#4F46E5; font-weight:600;
+       font-size:12px; margin-right:6px; }
+.tag { display:inline-block; font-size:12px; padding:3px 8px; border-radius:999px;
+       border:1px solid #e5e7eb; margin-right:6px; color:#475569; }
+
+/* intro block (no card/box) */
+.intro-wrap h1 { font-size:34px; margin:0 0 8px 0; }
+.intro-lead { 
+    color:#374151; 
+    font-size:15px; 
+    line-height:1.35; 
+    margin-bottom:16px;  /* Reduced from 28px to 16px */
+}
+.intro-bullets {
+    color:#374151;
+    font-size:15px;
+    line-height:1.35;
+    margin-top:16px;    /* Reduced from 28px to 16px */
+}
+.intro-bullets ul {
+    margin:0;
+    padding-left:20px;
+}
+
+/* deep-dive spacing */
+.dd-sep { height: 2px; }                 /* was 6px */
+.dd-rule {
+    height: 4px;
+    border-radius: 999px;
+    margin: 24px 0 8px 0;   /* was 22px, now 8px */
+}
+
+.badge { 
+    display:inline-block; 
+    font-size:11px; 
+    padding:2px 8px; 
+    border-radius:999px; 
+}
+.badge-was { 
+    background:#fee2e2; 
+    color:#b91c1c; 
+    border:1px solid #fecaca; 
+}
+.badge-now { 
+    background:#dcfce7; 
+    color:#166534; 
+    border:1px solid #bbf7d0; 
+}
+.card { 
+    background:#FCFBF7;  /* Match the overall background color */
+    border:1px solid #e5e7eb; 
+    border-radius:16px; 
+    padding:16px; 
+    box-shadow:0 1px 3px rgba(0,0,0,.04);
+    margin-bottom: 12px;  /* Add spacing between cards */
+}
+/* Tab styling */
+.stTabs [data-baseweb="tab-list"] {
+    gap: 24px;
+    margin-bottom: 16px;
+}
+.stTabs [data-baseweb="tab"] {
+    height: auto;
+    font-size: 64px !important;  /* Increased from 42px to 64px to match section headers */
+    font-weight: 700 !important;
+    color: #475569;
+    padding: 0;
+    line-height: 1.2 !important;  /* Added to improve spacing */
+}
+.stTabs [aria-selected="true"] {
+    color: #1f2937 !important;
+}
+.small-tab-header {
+    font-size: 16px;
+    font-weight: 600;
+    color: #475569;
+    margin-bottom: 12px;
+}
+
+/* small helper for logo column in timeline */
+.logo-cell { text-align:center; }
+</style>
+"""
+
+HERO = """
+<div class="hero">
+  <h1 style="margin:0 0 6px 0;">🌟 Promotion Summary</h1>
+  <div style="color:#475569; font-size:14px;">{summary}</div>
+  <div style="margin-top:10px;">
+    <span class="pill">Delivery Leadership</span>
+    <span class="pill">Stakeholder Trust</span>
+    <span class="pill">Commercial Impact</span>
+    <span class="pill">Data & AI</span>
+  </div>
+</div>
+"""
+
+
+def hero(summary):
+    return HERO.format(summary=summary)
+
+
+def bullet_preview(items, n=2):
+    out=[]
+    for x in items:
+        s=str(x).strip()
+        if not s or s.endswith(":"): continue
+        out.append(s)
+        if len(out)==n: break
+    return out
+
+
+def section_title(title, anchor=None):
+    at = f" id='{anchor}'" if anchor else ""
+    return f"<div class='section-title'{at}>{title}</div><div class='divider-dark'></div>"
+
+
+def bullets(items):
+    return "\n".join(f"- {s}" for s in (str(x).strip() for x in items) if s)
+
+
+def grouped(items):
+    """Matrix bullets; lines ending in ':' start a bold sub-heading group."""
+    if not items:
+        return ""
+    groups=[]; cur=[]; found=False
+    for raw in items:
+        s=str(raw).strip()
+        if not s: continue
+        if s.endswith(":"):
+            found=True
+            if cur: groups.append(cur)
+            cur=[s]
+        else:
+            if not cur and found: cur=["Details:"]
+            cur.append(s)
+    if cur: groups.append(cur)
+    if not found:
+        return bullets(items)
+    return "\n\n".join(f"**{grp[0]}**\n\n" + bullets(grp[1:]) for grp in groups if grp)
+
+
+def kpi_rule(color):
+    return f"<div class='dd-sep'></div><div class='dd-rule' style='background:{color}'></div>"
+
+
+def kpi_header(name, items, rule_before=None):
+    """Icon + title + two-bullet preview (optionally preceded by the previous KPI's rule)."""
+    icon = SECTION_ICONS.get(name,"📄")
+    out = [kpi_rule(rule_before)] if rule_before else []
+    out.append(
+        f"<div style='display:flex; align-items:center; gap:8px; margin:2px 0 6px 0;'>"
+        f"<div style='font-size:20px'>{icon}</div><div style='font-weight:700'>{name}</div></div>"
+    )
+    out += [f"• {p}" for p in bullet_preview(items, 2)]
+    return "\n\n".join(out)
+
+
+def highlight(h):
+    out = [f"**{h.get('title','')}**"]
+    meta = h.get("metric", ""); ctx = h.get("context","")
+    if meta: out.append(f"<span class='tag'>{meta}</span>")
+    if ctx:  out.append(f"<div style='margin:.25rem 0 1rem 0; color:#475569;'>{ctx}</div>")
+    return "\n\n".join(out)
+
+
+def quotes(items):
+    out = []
+    for q in items:
+        who = " — ".join([x for x in [q.get("name"), q.get("org")] if x])
+        out.append(f'> "{q.get("quote","")}"  \n— **{who}**')
+        out.append(SPACER)
+    return "\n\n".join(out)
+
+
+def improve_card(card, rule_before=False):
+    """Title + Was/Now badges of one improvement card (evidence stays an expander)."""
+    out = [kpi_rule("#6366F1")] if rule_before else []
+    out.append(f"**{card.get('title','')}**")
+    was = card.get("was",""); now = card.get("now","")
+    if was: out.append(f"<span class='badge badge-was'>Was</span> {was}")
+    if now: out.append(f"<span class='badge badge-now'>Now</span> {now}")
+    return "\n\n".join(out)
+
+
+def evidence(card):
+    evp = card.get("evidence_points", []) or []
+    return bullets(evp) if evp else (card.get("evidence", "") or "")
+
+
+# ─── section builders (whole slice in, every block of the section out) ─────────
+def highlights(items):
+    return tuple(highlight(h) for h in items)
+
+
+def kpi_blocks(matrix):
+    """(name, header, color) per KPI; each header carries the previous KPI's rule.
+    Details are paged separately (``grouped_page``)."""
+    out, color = [], None
+    for k, items in matrix.items():
+        out.append((k, kpi_header(k, items, rule_before=color), SECTION_COLORS.get(k,"#4F46E5")))
+        color = out[-1][2]
+    return tuple(out)
+
+
+def achievements(items):
+    """(line, note) per certification."""
+    out = []
+    for a in items:
+        icon=a.get("icon","🎓"); title=a.get("title",""); issuer=a.get("issuer","")
+        when=a.get("date",""); link=a.get("link")
+        line = f"{icon} **{title}** — {issuer}" + (f" · {when}" if when else "")
+        if link: line = f"[{line}]({link})"
+        out.append((line, a.get("note","")))
+    return tuple(out)
+
+
+def improve_cards(cards):
+    """(card, evidence) per improvement card."""
+    return tuple((improve_card(c, rule_before=i > 0), evidence(c)) for i, c in enumerate(cards))
+
+
+# ── windows of long lists: value is (items, lo), the window is items[lo:lo+PAGE] ──
+def pages(items):
+    return max(1, -(-len(items) // PAGE))
+
+
+def grouped_page(value):
+    """Matrix bullets of one window; the sub-heading in force at ``lo`` is repeated."""
+    items, lo = value
+    window = list(items[lo:lo + PAGE])
+    if lo and window and not str(window[0]).strip().endswith(":"):
+        for j in range(lo - 1, -1, -1):
+            if str(items[j]).strip().endswith(":"):
+                window.insert(0, items[j])
+                break
+    return grouped(window)
+
+
+def quotes_page(value):
+    items, lo = value
+    return quotes(items[lo:lo + PAGE])
+
+
+def improve_page(value):
+    """(card, evidence) per improvement card of one window."""
+    items, lo = value
+    return tuple((improve_card(c, rule_before=lo + i > 0), evidence(c)) for i, c in enumerate(items[lo:lo + PAGE]))
+
+
+def bullets_page(value):
+    items, lo = value
+    return bullets(items[lo:lo + PAGE])
+
+
+def feedback(fs):
+    """(quotes markdown, improvement cards) of the feedback section."""
+    if not isinstance(fs, Mapping):
+        return "", ()
+    return quotes(fs.get("quotes", [])), improve_cards(fs.get("improve", []))
+
+
+# ─── HTML (static export) ────────────────────────────────────────────────────────
+_INLINE = [
+    (re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)"), r'<a href="\2">\1</a>'),
+    (re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])"), r"<em>\1</em>"),
+]
+
+
+def _inline(text):
+    for pattern, repl in _INLINE:
+        text = pattern.sub(repl, text)
+    return text.replace("  \n", "<br>\n")
+
+
+def to_html(md):
+    """HTML for the markdown subset this module emits (paragraphs, ``- `` lists,
+    ``> `` quotes, bold/italic/links, raw HTML blocks); not a general parser."""
+    out = []
+    for block in re.split(r"\n\s*\n", md.strip()):
+        lines = block.split("\n")
+        if block.lstrip().startswith("<"):
+            out.append(block)
+        elif all(l.startswith("- ") for l in lines):
+            out.append("<ul>" + "".join(f"<li>{_inline(l[2:])}</li>" for l in lines) + "</ul>")
+        elif lines[0].startswith("> "):
+            out.append(f"<blockquote><p>{_inline(block[2:])}</p></blockquote>")
+        elif block.strip():
+            out.append(f"<p>{_inline(block)}</p>")
+    return "\n".join(out)
+
+
+def cached(fn, digest, value):
+    """``fn(value)`` memoised on ``digest`` (the content slice's hash); None disables."""
+    if digest is None:
+        return fn(value)
+    key = (fn.__name__, digest)
+    hit = _blocks.get(key)
+    if hit is None:
+        disk_key = f"{shared.code_version(sys.modules[__name__])}-{fn.__name__}-{digest}"
+        hit = shared.get("render", disk_key)
+        if hit is None:
+            hit = shared.put("render", disk_key, fn(value))
+        hit = _blocks.put(key, content.freeze(hit))  # JSON lists back to tuples
+    return hit
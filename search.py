@@ -0,0 +1,146 @@
+"""Search over the evidence: an inverted index, built once per content version.
+
+Indexed: KPI matrix bullets, feedback quotes, improvement cards (title, was,
+now, evidence points), highlights and achievements. Each bullet/quote/card
+field is one document that remembers the page section it belongs to
+(``SECTIONS``: anchor id + label), so a hit can link straight to it.
+
+The index is keyed on the digests of those sections and shared by every
+session and query; a query never walks the content tree. Terms are kept in
+a sorted vocabulary, so every query word is a prefix: ``stake`` matches
+``stakeholder`` and ``stakeholders``. Words are AND-ed; a document scores
+the sum over query words of its best tf·idf among the expansions, exact
+words counting double. Prefix expansions are memoised per index.
+"""
+import bisect, math, re
+from collections import defaultdict
+from collections.abc import Mapping
+
+from lru import LRU
+
+# section key -> (anchor id on the page, label)
+SECTIONS = {
+    "matrix": ("kpi-deep-dives", "KPI Deep-Dives"),
+    "highlights": ("highlights", "Highlights"),
+    "achievements": ("achievements", "Certifications & Achievements"),
+    "quotes": ("what-people-say", "What people say"),
+    "improve": ("incorporating-feedback", "Incorporating Feedback"),
+}
+INDEXED = ("matrix", "feedback_section", "highlights", "achievements")  # content keys
+MAX_HITS = 10
+SNIPPET = 160
+
+_WORD = re.compile(r"\w+")
+_indexes = LRU(32)
+
+
+def tokens(text):
+    return _WORD.findall(str(text).lower())
+
+
+def documents(C):
+    """(section, title, text) per searchable unit of one content document."""
+    out = []
+    for kpi, items in (C.get("matrix") or {}).items():
+        group = ""
+        for raw in items:
+            s = str(raw).strip()
+            if not s:
+                continue
+            if s.endswith(":"):
+                group = s[:-1]
+                continue
+            out.append(("matrix", f"{kpi} · {group}" if group else kpi, s))
+    for h in C.get("highlights") or []:
+        out.append(("highlights", h.get("title", ""), " — ".join(x for x in [h.get("metric"), h.get("context")] if x)))
+    for a in C.get("achievements") or []:
+        out.append(("achievements", a.get("title", ""), " — ".join(x for x in [a.get("issuer"), a.get("note")] if x)))
+    fs = C.get("feedback_section") or {}
+    if isinstance(fs, Mapping):
+        for q in fs.get("quotes") or []:
+            out.append(("quotes", " — ".join(x for x in [q.get("name"), q.get("org")] if x) or "Quote", q.get("quote", "")))
+        for card in fs.get("improve") or []:
+            title = card.get("title", "")
+            for field in ("was", "now"):
+                if card.get(field):
+                    out.append(("improve", f"{title} · {field.capitalize()}", card[field]))
+            for ev in card.get("evidence_points") or []:
+                out.append(("improve", f"{title} · Evidence", ev))
+            if card.get("evidence") and not card.get("evidence_points"):
+                out.append(("improve", f"{title} · Evidence", card["evidence"]))
+    return out
+
+
+class Index:
+    def __init__(self, docs):
+        self.docs = tuple(docs)
+        postings = defaultdict(dict)                  # term -> {doc: tf}
+        for i, (_section, title, text) in enumerate(self.docs):
+            for t in tokens(title) + tokens(text):
+                postings[t][i] = postings[t].get(i, 0) + 1
+        n = len(self.docs) or 1
+        # term -> ((doc, tf·idf), ...), ready to add up at query time
+        self.postings = {t: tuple((d, (1 + math.log(tf)) * math.log(1 + n / len(ps))) for d, tf in ps.items())
+                         for t, ps in postings.items()}
+        self.vocab = sorted(self.postings)
+        self._prefixes = LRU(512)
+
+    def expand(self, word):
+        """{doc: best weight} over every term starting with ``word``."""
+        hit = self._prefixes.get(word)
+        if hit is not None:
+            return hit
+        scores = {}
+        lo = bisect.bisect_left(self.vocab, word)
+        hi = bisect.bisect_left(self.vocab, word + "\uffff")
+        for term in self.vocab[lo:hi]:
+            boost = 2.0 if term == word else 1.0
+            for d, w in self.postings[term]:
+                if w * boost > scores.get(d, 0.0):
+                    scores[d] = w * boost
+        return self._prefixes.put(word, scores)
+
+    def search(self, query, limit=MAX_HITS):
+        """Ranked hits: dicts with section, anchor, label, title, snippet, score."""
+        words = tokens(query)
+        if not words:
+            return []
+        matches = sorted((self.expand(w) for w in dict.fromkeys(words)), key=len)
+        scores = dict(matches[0])
+        for m in matches[1:]:
+            scores = {d: s + m[d] for d, s in scores.items() if d in m}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:limit]
+        out = []
+        for d, score in ranked:
+            section, title, text = self.docs[d]
+            anchor, label = SECTIONS[section]
+            out.append({"section": section, "anchor": anchor, "label": label, "title": title,
+                        "snippet": snippet(text, words), "score": round(score, 3)})
+        return out
+
+
+def snippet(text, words, width=SNIPPET):
+    """``width`` characters of ``text`` around the first query word."""
+    text = str(text)
+    low = text.lower()
+    at = min((i for i in (low.find(w) for w in words) if i >= 0), default=0)
+    start = max(0, at - width // 3)
+    if start:
+        start = text.rfind(" ", 0, start) + 1
+    end = start + width
+    return ("…" if start else "") + text[start:end].strip() + ("…" if end < len(text) else "")
+
+
+def index(C, digests):
+    """The shared index for this content version (digests of the indexed sections)."""
+    key = tuple(digests.get(k, "") for k in INDEXED)  # "": section absent from this document
+    hit = _indexes.get(key)
+    if hit is None:
+        hit = _indexes.put(key, Index(documents(C)))
+    return hit
+
+
+def clear():
+    _indexes.clear()
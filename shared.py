@@ -0,0 +1,123 @@
+"""Host-wide second cache tier shared by every worker process.
+
+The in-process LRUs are per worker, so each ``streamlit run`` behind the load
+balancer would compile the timeline and render every section itself. With
+``PROMO_SHARED_CACHE=<dir>`` those results are also written to one file per
+key under ``<dir>/<namespace>/``; a freshly started worker finds them there
+and serves its first request warm (image variants are already shared: they
+live in the content-hashed ``static/assets``).
+
+Keys are content hashes, prefixed with a digest of the code that produced the
+value (``code_version``), so a deploy never reads stale output. Files are
+written to a temp name and renamed into place, so concurrent workers never
+see a partial entry; the OS page cache does the rest. Values are JSON.
+
+Some keys roll over daily (timeline and HTML downloads of open-ended
+ranges), so the tier is bounded: a read refreshes an entry's mtime, and at
+most every ``PRUNE_EVERY`` seconds a writer prunes, off its own thread,
+entries unused for ``PROMO_SHARED_CACHE_DAYS`` days and then the least
+recently used ones until the tier fits in ``PROMO_SHARED_CACHE_MB``.
+"""
+import hashlib, json, os, sys, threading, time
+
+ROOT = os.environ.get("PROMO_SHARED_CACHE")
+ENABLED = bool(ROOT)
+MAX_AGE = float(os.environ.get("PROMO_SHARED_CACHE_DAYS", "7")) * 86400
+MAX_BYTES = int(float(os.environ.get("PROMO_SHARED_CACHE_MB", "512")) * (1 << 20))
+PRUNE_EVERY = 600.0
+
+_versions = {}
+_prune_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def code_version(module):
+    """Short digest of ``module``'s source file."""
+    name = module.__name__
+    hit = _versions.get(name)
+    if hit is None:
+        with open(module.__file__, "rb") as f:
+            hit = _versions[name] = hashlib.sha256(f.read()).hexdigest()[:12]
+    return hit
+
+
+def _path(namespace, key):
+    return os.path.join(ROOT, namespace, key[-2:], f"{key}.json")  # keys end in a content hash
+
+
+def get(namespace, key, default=None):
+    if not ENABLED:
+        return default
+    try:
+        path = _path(namespace, key)
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return default
+    try:
+        os.utime(path)  # recently used: pruned last
+    except OSError:
+        pass
+    return value
+
+
+def put(namespace, key, value):
+    """Store ``value`` (best effort: a full or read-only disk only costs the warm start)."""
+    if not ENABLED:
+        return value
+    path = _path(namespace, key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"shared cache: cannot write {path}: {e}", file=sys.stderr)
+    _maybe_prune()
+    return value
+
+
+def _maybe_prune():
+    global _last_prune
+    now = time.monotonic()
+    with _prune_lock:
+        if now - _last_prune < PRUNE_EVERY:
+            return
+        _last_prune = now
+    threading.Thread(target=prune, name="promo-shared-prune", daemon=True).start()
+
+
+def prune(max_age=None, max_bytes=None):
+    """Drop entries unused for ``max_age`` seconds, then the least recently used
+    until the tier is under ``max_bytes``; returns how many files were removed."""
+    max_age = MAX_AGE if max_age is None else max_age
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    entries, total, removed = [], 0, 0
+    cutoff = time.time() - max_age
+    for d, _, files in os.walk(ROOT):
+        for name in files:
+            path = os.path.join(d, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if st.st_mtime < cutoff:
+                removed += _remove(path)
+            elif name.endswith(".json"):
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+    for _mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        removed += _remove(path)
+        total -= size
+    return removed
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return 1
+    except OSError:  # another worker pruned it first
+        return 0
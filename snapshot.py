@@ -0,0 +1,121 @@
+"""Precompiled content snapshots: memory-mapped, decoded one section at a time.
+
+``python snapshot.py build`` compiles data/content.json (and every profile)
+into a ``.snap`` file next to it:
+
+    header   magic, python version, source (mtime_ns, size, sha256), count
+    table    per section: name, offset, length, sha256 of the section
+    blobs    one ``marshal`` blob per section
+
+Workers ``mmap`` the file and decode a section only when a render first
+touches it, so every process on the host shares the same page-cache pages
+and holds only the sections it used. The JSON stays the source of truth: a
+snapshot is used only while the recorded source stat still matches (and was
+written by the same Python, since marshal is version-specific); otherwise
+``content`` parses the JSON as before. Enabled with ``PROMO_SNAPSHOTS=1``.
+"""
+import hashlib, json, marshal, mmap, os, struct, sys, threading
+from collections.abc import Mapping
+from types import MappingProxyType
+
+import content
+
+ENABLED = os.environ.get("PROMO_SNAPSHOTS") == "1"
+EXT = ".snap"
+MAGIC = b"PROMOSN1"
+_HEAD = struct.Struct("<8sHHqqI32s")   # magic, py major, py minor, mtime_ns, size, count, sha256
+_ENTRY = struct.Struct("<QQ32s")       # offset, length, sha256 (after a <H-prefixed name)
+_NAME = struct.Struct("<H")
+
+
+def path_for(json_path):
+    return os.path.splitext(json_path)[0] + EXT
+
+
+def compile(json_path, out=None):
+    """Write the snapshot for ``json_path``; returns its path."""
+    out = out or path_for(json_path)
+    with open(json_path, "rb") as f:
+        raw = f.read()
+        st = os.fstat(f.fileno())
+    doc = json.loads(raw.decode("utf-8"))
+    blobs, table = [], []
+    for name, value in doc.items():
+        blob = marshal.dumps(value)
+        digest = bytes.fromhex(content.slice_digest(value))
+        blobs.append(blob)
+        table.append((name.encode("utf-8"), len(blob), digest))
+    offset = _HEAD.size + sum(_NAME.size + len(n) + _ENTRY.size for n, _, _ in table)
+    tmp = f"{out}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEAD.pack(MAGIC, *sys.version_info[:2], st.st_mtime_ns, st.st_size, len(table),
+                           hashlib.sha256(raw).digest()))
+        for name, length, digest in table:
+            f.write(_NAME.pack(len(name)) + name + _ENTRY.pack(offset, length, digest))
+            offset += length
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp, out)  # readers keep their mapping of the old inode
+    return out
+
+
+class Snapshot(Mapping):
+    """Read-only, lazily decoded document backed by an mmap of a ``.snap`` file."""
+
+    def __init__(self, mm, sections, source_digest):
+        self._mm = mm
+        self._sections = sections        # name -> (offset, length)
+        self._decoded = {}
+        self._lock = threading.Lock()
+        self.source_digest = source_digest
+
+    def __getitem__(self, name):
+        hit = self._decoded.get(name)
+        if hit is None:
+            off, length = self._sections[name]      # KeyError for unknown sections
+            with self._lock:
+                hit = self._decoded.get(name)
+                if hit is None:
+                    hit = self._decoded[name] = content.freeze(marshal.loads(self._mm[off:off + length]))
+        return hit
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+
+def open_for(json_path, stat):
+    """(document, section digests) from the snapshot of ``json_path`` if it is
+    fresh for ``stat`` = (mtime_ns, size), else None."""
+    try:
+        f = open(path_for(json_path), "rb")
+    except OSError:
+        return None
+    with f:
+        head = f.read(_HEAD.size)
+        if len(head) < _HEAD.size:
+            return None
+        magic, major, minor, mtime_ns, size, count, sha = _HEAD.unpack(head)
+        if magic != MAGIC or (major, minor) != sys.version_info[:2] or (mtime_ns, size) != tuple(stat):
+            return None
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # stays valid after close
+    pos, sections, digests = _HEAD.size, {}, {}
+    for _ in range(count):
+        (n,) = _NAME.unpack_from(mm, pos); pos += _NAME.size
+        name = mm[pos:pos + n].decode("utf-8"); pos += n
+        off, length, digest = _ENTRY.unpack_from(mm, pos); pos += _ENTRY.size
+        sections[name] = (off, length)
+        digests[name] = digest.hex()
+    return Snapshot(mm, sections, sha.hex()), MappingProxyType(digests)
+
+
+if __name__ == "__main__":
+    import profiles
+
+    if sys.argv[1:2] != ["build"]:
+        sys.exit("usage: python snapshot.py build [content.json ...]")
+    for src in sys.argv[2:] or [profiles.content_path("")] + sorted(profiles.index().values()):
+        out = compile(src)
+        print(f"{src:40s} {os.path.getsize(src):>9d} -> {os.path.getsize(out):>9d}  {out}")
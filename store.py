@@ -0,0 +1,216 @@
+"""Optional SQLite content backend: one row per profile section.
+
+Enabled with ``PROMO_CONTENT_DB=<path>``. Each top-level key of a content
+document (summary, matrix, timeline_ranges, feedback_section, ...) is a row
+keyed by ``(profile, section)``, so an edit rewrites one section in one
+transaction instead of the whole document, and readers re-parse only the
+sections whose version moved (``digests(slug)`` gives per-section keys for
+the render caches, as ``content.digests`` does for files). Every write bumps the profile's ``version``
+counter; ``version(slug)`` is a primary-key lookup the renderer can poll on
+every rerun.
+
+Readers get the same frozen views as ``content.load``. JSON stays the
+interchange format:
+
+    python store.py import data/content.json [--profile default]
+    python store.py export default out.json
+    python store.py set default growth growth.json
+"""
+import argparse, hashlib, json, os, sys, threading
+from contextlib import contextmanager
+from types import MappingProxyType
+
+import content
+from lru import LRU
+
+DB_PATH = os.environ.get("PROMO_CONTENT_DB")
+DEFAULT = "default"            # profile served without ?profile=
+CACHE_SIZE = int(os.environ.get("PROMO_CONTENT_CACHE", "256"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    slug    TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sections (
+    profile TEXT NOT NULL REFERENCES profiles(slug) ON DELETE CASCADE,
+    name    TEXT NOT NULL,
+    pos     INTEGER NOT NULL,       -- key order of the source document
+    version INTEGER NOT NULL,       -- profile version of the last write to this row
+    body    TEXT NOT NULL,          -- JSON
+    PRIMARY KEY (profile, name)
+) WITHOUT ROWID;
+"""
+
+_conns = {}                    # db path -> (connection, lock), one per process
+_lock = threading.Lock()
+_docs = LRU(CACHE_SIZE)        # (db, slug) -> (version, {section: (row version, frozen, sha256)}, doc, digests)
+_slugs = {}                    # db -> ((profile count, max version), frozenset of known profiles)
+
+
+def connect(path=None):
+    """(connection, lock) shared by every thread of the process: Streamlit runs
+    each rerun on a fresh thread, so a per-thread connection would reopen the
+    file and rerun the schema DDL every time. Hold the lock around each use."""
+    import sqlite3
+
+    path = _abs(path)
+    hit = _conns.get(path)
+    if hit is None:
+        with _lock:
+            hit = _conns.get(path)
+            if hit is None:
+                db = sqlite3.connect(path, isolation_level=None,  # explicit BEGIN/COMMIT below
+                                     check_same_thread=False)     # serialised by the lock instead
+                db.execute("PRAGMA journal_mode=WAL")            # readers never block the writer
+                db.execute("PRAGMA foreign_keys=ON")
+                db.executescript(SCHEMA)
+                hit = _conns[path] = (db, threading.RLock())
+    return hit
+
+
+@contextmanager
+def _db(path=None):
+    db, lock = connect(path)
+    with lock:
+        yield db
+
+
+def _abs(path):
+    return os.path.abspath(path or DB_PATH)
+
+
+def _write(db, slug, sections, replace=False):
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        db.execute("INSERT OR IGNORE INTO profiles(slug) VALUES (?)", (slug,))
+        db.execute("UPDATE profiles SET version = version + 1 WHERE slug = ?", (slug,))
+        (ver,) = db.execute("SELECT version FROM profiles WHERE slug = ?", (slug,)).fetchone()
+        if replace:
+            db.execute("DELETE FROM sections WHERE profile = ?", (slug,))
+        (pos,) = db.execute("SELECT COALESCE(MAX(pos) + 1, 0) FROM sections WHERE profile = ?", (slug,)).fetchone()
+        for name, value in sections.items():
+            body = json.dumps(content.thaw(value), ensure_ascii=False)
+            cur = db.execute("UPDATE sections SET body = ?, version = ? WHERE profile = ? AND name = ?",
+                             (body, ver, slug, name))
+            if not cur.rowcount:
+                db.execute("INSERT INTO sections VALUES (?, ?, ?, ?, ?)", (slug, name, pos, ver, body))
+                pos += 1
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    return ver
+
+
+def put_section(slug, name, value, path=None):
+    """Replace one section in its own transaction; returns the new profile version."""
+    with _db(path) as db:
+        ver = _write(db, slug, {name: value})
+    _slugs.pop(_abs(path), None)
+    return ver
+
+
+def put_document(slug, doc, path=None):
+    """Replace a whole profile (every section) atomically."""
+    with _db(path) as db:
+        ver = _write(db, slug, doc, replace=True)
+    _slugs.pop(_abs(path), None)
+    return ver
+
+
+def version(slug, path=None):
+    """Change counter of ``slug`` (None if unknown); bumps on every write."""
+    with _db(path) as db:
+        row = db.execute("SELECT version FROM profiles WHERE slug = ?", (slug,)).fetchone()
+    return row[0] if row else None
+
+
+def section(slug, name, path=None):
+    """One section, parsed on its own (frozen view); None if missing."""
+    with _db(path) as db:
+        row = db.execute("SELECT body FROM sections WHERE profile = ? AND name = ?", (slug, name)).fetchone()
+    return content.freeze(json.loads(row[0])) if row else None
+
+
+def slugs(path=None):
+    """Known profiles; re-listed only when the profiles table moved, which also
+    catches imports run by other processes (``python store.py import``)."""
+    key = _abs(path)
+    with _db(path) as db:
+        stamp = tuple(db.execute("SELECT count(*), max(version) FROM profiles").fetchone())
+        hit = _slugs.get(key)
+        if hit is None or hit[0] != stamp:
+            hit = _slugs[key] = (stamp, frozenset(r[0] for r in db.execute("SELECT slug FROM profiles")))
+    return hit[1]
+
+
+def load(slug, path=None):
+    """Whole profile as a frozen mapping; only sections written since the last
+    call are re-read and re-parsed. Raises KeyError for an unknown profile."""
+    return _load(slug, path)[2]
+
+
+def digests(slug, path=None):
+    """{section: sha256 of its stored JSON} for the current version of ``slug``."""
+    return _load(slug, path)[3]
+
+
+def _load(slug, path=None):
+    key = (_abs(path), slug)
+    ver = version(slug, path)
+    if ver is None:
+        raise KeyError(slug)
+    hit = _docs.get(key)
+    if hit and hit[0] == ver:
+        return hit
+    parsed = dict(hit[1]) if hit else {}
+    with _db(path) as db:
+        rows = db.execute("SELECT name, version FROM sections WHERE profile = ? ORDER BY pos", (slug,)).fetchall()
+        stale = [name for name, v in rows if parsed.get(name, (None,))[0] != v]
+        changed = db.execute(
+            f"SELECT name, version, body FROM sections WHERE profile = ? AND name IN ({','.join('?' * len(stale))})",
+            (slug, *stale)).fetchall() if stale else []
+    for name, v, body in changed:
+        parsed[name] = (v, content.freeze(json.loads(body)), hashlib.sha256(body.encode("utf-8")).hexdigest())
+    parsed = {name: parsed[name] for name, _ in rows}
+    doc = MappingProxyType({name: p[1] for name, p in parsed.items()})
+    sections = MappingProxyType({name: p[2] for name, p in parsed.items()})
+    return _docs.put(key, (ver, parsed, doc, sections))
+
+
+def import_json(json_path, slug=DEFAULT, path=None):
+    with open(json_path, "r", encoding="utf-8") as f:
+        return put_document(slug, json.load(f), path)
+
+
+def export_json(slug, json_path, path=None):
+    doc = content.thaw(load(slug, path))
+    tmp = f"{json_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, json_path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="SQLite content store")
+    ap.add_argument("--db", default=DB_PATH or "data/content.db")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("import"); p.add_argument("json"); p.add_argument("--profile", default=DEFAULT)
+    p = sub.add_parser("export"); p.add_argument("profile"); p.add_argument("json")
+    p = sub.add_parser("set"); p.add_argument("profile"); p.add_argument("section"); p.add_argument("json")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "import":
+        print(f"{args.profile}: version {import_json(args.json, args.profile, args.db)}")
+    elif args.cmd == "export":
+        export_json(args.profile, args.json, args.db)
+    else:
+        with open(args.json, "r", encoding="utf-8") as f:
+            value = json.load(f)
+        print(f"{args.profile}: version {put_section(args.profile, args.section, value, args.db)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
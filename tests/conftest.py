@@ -0,0 +1,4 @@
+import os, sys
+
+# the app is flat modules next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,29 @@
+"""assets.py lookups when no variant could be built."""
+import os
+
+import pytest
+
+import assets
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def unbuilt(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setattr(assets, "CACHE_DIR", str(blocker / "cache"))  # can't be created
+    assets._built = False
+    yield
+    assets._built = False  # the index now points at sources: the next user rebuilds it
+
+
+def test_failed_build_serves_the_sources(unbuilt):
+    assets.ensure_built()
+    assert assets.find("intro_photo.png") == os.path.join("data", "assets", "intro_photo.png")
+    assert assets.find("aemo.png") == os.path.join("data", "assets", "aemo.png")
+    assert assets.find("AEMO") == assets.find("aemo.png")
+    assert assets.by_role("photo") == [os.path.join("data", "assets", "intro_photo.png")]
+    assert assets.info("aemo.png")["role"] == "logo"
+    assert assets.find("intro_photo.png", "someone") is None  # still never borrowed
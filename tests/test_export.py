@@ -0,0 +1,28 @@
+"""export.py against the repo's own default document and shared images."""
+import os
+
+import pytest
+
+import assets
+import export
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.delenv("PROMO_CONTENT", raising=False)
+
+
+def test_default_page_has_the_shared_intro_photo(repo, tmp_path):
+    assert export.main([os.path.join("data", "content.json"), "--out", str(tmp_path), "--jobs", "1"]) == 0
+    text = (tmp_path / "content" / "index.html").read_text(encoding="utf-8")
+    photo = os.path.basename(assets.find("intro_photo.png"))
+    assert f"<img src='../assets/{photo}'" in text
+    assert (tmp_path / "assets" / photo).exists()
+
+
+def test_default_document_is_exported_with_the_shared_scope(repo):
+    path, name, scope = export.jobs_for([])[0]
+    assert (name, scope) == (export.DEFAULT_SLUG, "")
@@ -0,0 +1,136 @@
+"""remote.py against a local stand-in content service (http.server on a free port)."""
+import hashlib, json, os, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import profiles
+import remote
+import watcher
+
+DOC = {"name": "Alice", "intro": {"photo": "alice.png"}, "logos": {"AEMO": "aemo.png"}}
+
+
+class Service(BaseHTTPRequestHandler):
+    files = {}       # path -> body bytes
+    log = []         # (path, status)
+
+    def do_GET(self):
+        body = self.files.get(self.path)
+        if body is None:
+            return self._reply(404)
+        etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            return self._reply(304, etag=etag)
+        self._reply(200, body, etag)
+
+    def _reply(self, status, body=b"", etag=None):
+        self.log.append((self.path, status))
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    Service.files = {
+        "/index.json": json.dumps(["alice"]).encode(),
+        "/default.json": json.dumps({"name": "Default"}).encode(),
+        "/alice.json": json.dumps(DOC).encode(),
+        "/alice/assets/alice.png": b"photo-bytes",
+        "/alice/assets/aemo.png": b"logo-bytes",
+    }
+    Service.log = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Service)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    monkeypatch.setenv("PROMO_CONTENT", str(tmp_path / "content.json"))
+    monkeypatch.setattr(profiles, "PROFILES_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setattr(profiles, "SHARED_ASSET_DIRS", [str(tmp_path / "assets")])
+    monkeypatch.setattr(profiles, "_index", None)
+    monkeypatch.setattr(remote, "URL", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(remote, "_validators", None)
+    monkeypatch.setattr(remote, "_http", None)
+    notified = []
+    monkeypatch.setattr(watcher, "notify", notified.append)
+    server.notified = notified
+    server.root = tmp_path
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _mtimes(root):
+    return {os.path.join(d, f): os.stat(os.path.join(d, f)).st_mtime_ns
+            for d, _, files in os.walk(root) for f in files}
+
+
+def test_first_sync_mirrors_documents_and_assets(service):
+    changed = remote.sync()
+    root = service.root
+    assert json.loads((root / "profiles" / "alice.json").read_bytes()) == DOC
+    assert (root / "profiles" / "alice" / "assets" / "alice.png").read_bytes() == b"photo-bytes"
+    assert (root / "content.json").exists()
+    assert sorted(changed) == sorted(service.notified)
+    assert profiles.content_path("alice") == str(root / "profiles" / "alice.json")
+
+
+def test_304_writes_nothing(service):
+    remote.sync()
+    before, service.notified[:] = _mtimes(service.root), []
+    Service.log = []
+    assert remote.sync() == []
+    assert {s for p, s in Service.log if p != "/index.json"} == {304}
+    assert _mtimes(service.root) == before
+    assert service.notified == []
+
+
+def test_200_with_same_bytes_does_not_invalidate(service):
+    remote.sync()
+    remote._validators.clear()  # validators lost: the service answers 200 with the same body
+    before, service.notified[:] = _mtimes(service.root), []
+    Service.log = []
+    assert remote.sync() == []
+    assert ("/alice.json", 200) in Service.log
+    assert {p: t for p, t in _mtimes(service.root).items() if not p.endswith(remote.STATE)} == \
+           {p: t for p, t in before.items() if not p.endswith(remote.STATE)}
+    assert service.notified == []
+
+
+def test_changed_document_is_mirrored_and_notified(service):
+    remote.sync()
+    service.notified[:] = []
+    Service.files["/alice.json"] = json.dumps(dict(DOC, name="Alice B")).encode()
+    path = str(service.root / "profiles" / "alice.json")
+    assert remote.sync() == [path]
+    assert json.loads(open(path, "rb").read())["name"] == "Alice B"
+    assert service.notified == [path]
+
+
+def test_service_down_keeps_last_good_copy(service):
+    remote.sync()
+    before = _mtimes(service.root)
+    service.shutdown()
+    service.server_close()
+    with pytest.raises(OSError):
+        remote.sync()
+    assert _mtimes(service.root) == before
+    assert json.loads((service.root / "profiles" / "alice.json").read_bytes()) == DOC
+
+
+def test_malformed_document_does_not_replace_mirror(service):
+    remote.sync()
+    service.notified[:] = []
+    Service.files["/alice.json"] = b'{"name": "Alice", '  # half-published
+    assert remote.sync() == []
+    assert json.loads((service.root / "profiles" / "alice.json").read_bytes()) == DOC
+    assert service.notified == []
+    # fixed upstream: picked up on the next poll
+    Service.files["/alice.json"] = json.dumps(dict(DOC, name="Alice C")).encode()
+    assert remote.sync() == [str(service.root / "profiles" / "alice.json")]
@@ -0,0 +1,32 @@
+"""store.py: one connection per process, shared by every rerun thread."""
+import threading
+
+import store
+
+
+def test_threads_share_one_connection(tmp_path):
+    db = str(tmp_path / "content.db")
+    store.put_document("alice", {"name": "Alice", "growth": ["a"]}, db)
+    seen, errors = [], []
+
+    def rerun():  # what a ScriptRunner thread does each rerun
+        try:
+            seen.append((store.connect(db)[0], store.load("alice", db)["name"], "alice" in store.slugs(db)))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=rerun) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert not errors
+    assert len({id(c) for c, _, _ in seen}) == 1
+    assert {(n, k) for _, n, k in seen} == {("Alice", True)}
+
+
+def test_write_from_another_thread_is_seen(tmp_path):
+    db = str(tmp_path / "content.db")
+    store.put_document("alice", {"name": "Alice"}, db)
+    assert store.load("alice", db)["name"] == "Alice"
+    t = threading.Thread(target=store.put_section, args=("alice", "name", "Alice B", db))
+    t.start(); t.join()
+    assert store.load("alice", db)["name"] == "Alice B"
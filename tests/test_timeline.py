@@ -0,0 +1,28 @@
+"""timeline.prepare merge tolerances (detail bars vs overview strip)."""
+from datetime import date
+
+import pandas as pd
+
+import timeline
+
+TODAY = date(2025, 1, 1)
+# ten years of history; two engagements three days apart (under a pixel of the whole history) near the end
+RANGES = [
+    {"lane": "Client — AEMO", "start": "2014-01-01", "end": "2015-01-01", "label": "a"},
+    {"lane": "Client — IAG", "start": "2024-01-01", "end": "2024-03-01", "label": "b"},
+    {"lane": "Client — IAG", "start": "2024-03-04", "end": "2024-06-01", "label": "c"},
+    {"lane": "Client — IAG", "start": "2024-05-01", "end": "2024-07-01", "label": "d"},  # overlaps c
+]
+
+
+def test_detail_keeps_gaps_visible_at_the_zoom_floor():
+    df, _ = timeline.prepare(RANGES, TODAY, window=pd.Timedelta(days=timeline.ZOOM_FLOOR_DAYS))
+    iag = df[df["org"] == "IAG"].sort_values("start")
+    assert list(iag["n"]) == [1, 2]  # b stays its own bar, c and d overlap
+    assert str(iag["end"].iloc[0].date()) == "2024-03-01"
+
+
+def test_overview_merges_within_a_pixel_of_the_whole_history():
+    df, _ = timeline.prepare(RANGES, TODAY)
+    assert list(df[df["org"] == "IAG"]["n"]) == [3]
+    assert int(df["n"].sum()) == len(RANGES)
@@ -0,0 +1,232 @@
+"""Journey timeline: Vega-Lite spec (logo column + gantt bars), memoised.
+
+Building the chart is a pandas + Altair + JSON pipeline; the result only
+depends on the ranges, the resolved logo files (and how they are addressed,
+see ``assets.URL_MODE``) and -- for open-ended ranges -- today's date, so
+those are the cache key and a repeat render is a dict lookup.
+Zoom, pan (overview brush) and client/internal filtering (legend) are
+Vega-Lite selection params evaluated in the browser; ``selected_window``
+reads the brush back when the caller opts into ``on_select``.
+
+``prepare`` merges ranges closer than one pixel of the time axis. The
+overview strip is never zoomed, so its pixel is one of the whole history and
+its rows stay bounded however long that grows. The detail bars are zoomed by
+the brush, so theirs is a pixel at ``ZOOM_FLOOR_DAYS`` (the narrowest window
+they are meant to be read at): separate engagements stay separate bars at
+any zoom down to that, and only overlapping or abutting ones are merged.
+
+pandas and Altair are only imported when a spec is first compiled (in
+progressive mode on the background pool, while the first paint goes out):
+they dominate worker cold start and no other section needs them.
+"""
+import hashlib, json, os, sys
+from datetime import date, datetime, timezone
+
+import assets
+import content
+import perf
+import shared
+from lru import LRU
+
+REQUIRED = ["lane","start","end","label"]
+MAX_SPECS = int(os.environ.get("PROMO_SPEC_CACHE", "256"))
+MERGE = os.environ.get("PROMO_TIMELINE_MERGE", "1") != "0"   # merge ranges closer than a pixel
+WIDTH = 980                                                   # bar chart width (px)
+ZOOM_FLOOR_DAYS = float(os.environ.get("PROMO_TIMELINE_ZOOM_FLOOR", "30"))  # detail merges stay exact down to this window
+OVERVIEW_HEIGHT = 36
+BRUSH, WORK_TYPE = "brush", "work_type"                       # Vega-Lite selection param names
+
+_specs = LRU(MAX_SPECS)
+
+
+def spec_key(ranges, logos, today, digest=None):
+    # ``digest`` (content.digests()["timeline_ranges"]) saves re-serialising the ranges
+    payload = [digest or content.thaw(ranges), sorted(logos.items()), today.isoformat(), assets.URL_MODE]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _clean(row):
+    # NaN is not valid JSON; Vega expects null
+    return {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+
+
+def _inline_datasets(spec):
+    # Altair hoists data into top-level named "datasets"; inline them per view so
+    # the cached spec is plain JSON that Streamlit ships without re-encoding frames
+    datasets = spec.pop("datasets", {})
+    def walk(node):
+        if isinstance(node, dict):
+            data = node.get("data")
+            if isinstance(data, dict) and data.get("name") in datasets:
+                node["data"] = {"values": [_clean(r) for r in datasets[data["name"]]]}
+            for v in node.values(): walk(v)
+        elif isinstance(node, list):
+            for v in node: walk(v)
+    walk(spec)
+    return spec
+
+
+def orgs(ranges):
+    """Client organisations on the timeline, in order (cheap: no pandas)."""
+    out = {}
+    for r in ranges:
+        lane = str(r.get("lane", ""))
+        if not lane.startswith("Internal"):
+            out.setdefault(lane.replace("Client — ", ""), None)
+    return list(out)
+
+
+def prepare(ranges, today, merge=MERGE, window=None):
+    """Vectorised chart data: (DataFrame, lane order).
+
+    Lanes are categorised and ordered (first appearance) with column ops. With
+    ``merge``, ranges that overlap or touch within one pixel of the time axis
+    are merged per lane: a pixel of ``window`` (the narrowest span the chart
+    can be zoomed to) if given, else of the whole history, which bounds the
+    row count by what can actually be drawn.
+    """
+    pd = perf.lazy_import("pandas")
+    df = pd.DataFrame(content.thaw(ranges))
+    for col in REQUIRED:
+        if col not in df.columns:
+            raise ValueError(f"timeline_ranges missing '{col}'")
+
+    df["start"] = pd.to_datetime(df["start"], errors="coerce")
+    df["end"]   = pd.to_datetime(df["end"],   errors="coerce").fillna(pd.to_datetime(today))
+    df = df.dropna(subset=["start"])
+    df["lane"] = df["lane"].astype(str)
+    lanes = pd.unique(df["lane"])  # original order, clients and internals as listed
+    df["n"] = 1                    # engagements per bar (summed when bars merge)
+
+    if merge and len(df) > 1:
+        span = df["end"].max() - df["start"].min()
+        if window is None:
+            tol = max(pd.Timedelta(days=1), span / WIDTH)  # closer than a pixel (or a day) reads as one bar
+        else:
+            tol = min(span, window) / WIDTH                 # a pixel at full zoom: a day apart stays apart
+        df = df.sort_values(["lane", "start"], kind="stable")
+        reach = df.groupby("lane", sort=False)["end"].cummax().groupby(df["lane"], sort=False).shift()
+        run = (reach.isna() | (df["start"] > reach + tol)).cumsum()
+        df = (df.groupby(run, sort=False)
+                .agg(lane=("lane", "first"), start=("start", "min"), end=("end", "max"),
+                     label=("label", "first"), n=("n", "sum"))
+                .reset_index(drop=True))
+
+    # client vs internal, pretty org label
+    internal = df["lane"].str.startswith("Internal")
+    df["is_client"] = ~internal
+    df["org"] = df["lane"].where(internal, df["lane"].str.replace("Client — ", "", regex=False))
+    df["group"] = df["is_client"].map({True:"Client", False:"Internal"})
+    y_order = [l if l.startswith("Internal") else l.replace("Client — ", "") for l in lanes]
+    return df, y_order
+
+
+def build_spec(ranges, logos, today):
+    """Compile the timeline chart. ``logos`` maps organisation -> image path."""
+    alt = perf.lazy_import("altair")
+    pd = perf.lazy_import("pandas")
+    df, y_order = prepare(ranges, today, window=pd.Timedelta(days=ZOOM_FLOOR_DAYS))  # detail: brushed
+    strip, _ = prepare(ranges, today)                                                # overview: whole history
+
+    # short static URLs (cached by the browser) unless inlining is forced
+    icons = {org: assets.url(path) for org, path in logos.items()}
+    df["icon"] = df["org"].map({org: u for org, u in icons.items() if u})
+
+    # client-side exploration, no server round trip: the overview brush sets the
+    # detail's time window (drag to pan, wheel to zoom, double-click to reset)
+    # and clicking the legend fades client or internal work
+    brush = alt.selection_interval(name=BRUSH, encodings=["x"])
+    work = alt.selection_point(name=WORK_TYPE, fields=["group"], bind="legend")
+    colors = alt.Scale(domain=["Client","Internal"], range=["#6366F1","#94A3B8"])
+
+    # bars (main timeline)
+    bars = (
+        alt.Chart(df[["org", "start", "end", "group", "n"]])  # only encoded fields go over the wire
+        .mark_bar(cornerRadius=6, stroke="white", strokeWidth=0.6, clip=True)
+        .encode(
+            x=alt.X("start:T", title="", axis=alt.Axis(format="%b %Y"), scale=alt.Scale(domain=brush)),
+            x2=alt.X2("end:T"),
+            y=alt.Y("org:N", sort=y_order, title="", axis=alt.Axis(labels=False)), # Hide labels
+            color=alt.Color(
+                "group:N", title="Work type", scale=colors,
+                legend=alt.Legend(orient="bottom", direction="horizontal")
+            ),
+            opacity=alt.condition(work, alt.value(1.0), alt.value(0.15)),
+            tooltip=[
+                alt.Tooltip("org:N", title="Organisation"),
+                alt.Tooltip("start:T", title="Start"),
+                alt.Tooltip("end:T", title="End"),
+                alt.Tooltip("n:Q", title="Engagements"),  # > 1 where ranges were merged
+            ],
+        )
+        .add_params(work)
+        .properties(width=WIDTH, height=240)
+    )
+
+    # overview strip: whole history, one row, carries the brush
+    overview = (
+        alt.Chart(strip[["start", "end", "group"]])
+        .mark_bar(cornerRadius=2)
+        .encode(
+            x=alt.X("start:T", title="", axis=alt.Axis(format="%Y", grid=False)),
+            x2=alt.X2("end:T"),
+            color=alt.Color("group:N", scale=colors, legend=None),
+            opacity=alt.value(0.5),
+        )
+        .add_params(brush)
+        .properties(width=WIDTH, height=OVERVIEW_HEIGHT)
+    )
+
+    # logo column (clients only); tooltip shows ONLY organisation
+    df_logo = df[(df["is_client"]) & (df["icon"].notna())][["org", "icon"]].drop_duplicates("org")  # one per row of the column
+    logo_col = (
+        alt.Chart(df_logo)
+        .mark_image(width=40, height=40)
+        .encode(
+            y=alt.Y("org:N", sort=y_order, title=""),
+            x=alt.value(26),  # center inside narrow column
+            url=alt.Url("icon:N"),
+            tooltip=[alt.Tooltip("org:N", title="Organisation")]
+        )
+        .properties(width=60, height=240)
+    )
+
+    # concat WITHOUT configure on subcharts; apply on final chart only
+    timeline = alt.vconcat(bars, overview, spacing=6).resolve_scale(x="independent")
+    chart = alt.hconcat(logo_col, timeline, spacing=8).resolve_scale(y='shared')
+    chart = chart.configure_view(stroke=None)
+    return _inline_datasets(chart.to_dict())
+
+
+def selected_window(event):
+    """(start, end) dates of the brushed window in a ``st.vega_lite_chart``
+    selection event, or None when nothing is brushed."""
+    window = ((event or {}).get("selection") or {}).get(BRUSH, {}).get("start")
+    if not window or len(window) != 2:
+        return None
+    def day(v):
+        if isinstance(v, (int, float)):  # Vega hands back epoch milliseconds
+            return datetime.fromtimestamp(v / 1000, timezone.utc).date()
+        return date.fromisoformat(str(v)[:10])
+    return tuple(sorted(day(v) for v in window))
+
+
+def cached_spec(ranges, logos, today=None, digest=None):
+    """The spec if this process already holds it, else None (never builds)."""
+    return _specs.get(spec_key(ranges, logos, today or date.today(), digest))
+
+
+def compiled_spec(ranges, logos, today=None, digest=None):
+    """Memoised ``build_spec``; ``today`` is an explicit day-granularity key and
+    ``digest`` the ranges' slice digest, if the caller has one."""
+    today = today or date.today()
+    key = spec_key(ranges, logos, today, digest)
+    spec = _specs.get(key)
+    if spec is None:
+        # another worker on this host may have compiled it already (no pandas/Altair import then)
+        disk_key = f"{shared.code_version(sys.modules[__name__])}-{key}"
+        spec = shared.get("timeline", disk_key)
+        if spec is None:
+            spec = shared.put("timeline", disk_key, build_spec(ranges, logos, today))
+        spec = _specs.put(key, spec)
+    return spec
@@ -0,0 +1,178 @@
+"""Hot reload: one background watcher per process for content and asset files.
+
+The first ``start()`` launches a watchdog observer (inotify on Linux) over
+the content and asset directories, or, without watchdog, a thread that
+stats the same files every ``POLL_EVERY`` seconds. Changes are debounced
+(editors save in bursts: temp file, rename, touch) and then applied once for
+the whole worker: changed documents are re-parsed into the shared
+``content`` cache, the profile index and image variants are refreshed, and
+``version()`` moves, so the next rerun of any session renders the new
+content -- one parse per change, however many sessions are connected.
+
+Pushing the change to a page nobody touches is opt-in, for whoever is
+editing: with ``?live=1`` (or ``PROMO_LIVE_RELOAD=1`` for every session, on
+an editor-only deployment) the session runs a tiny fragment every
+``RELOAD_EVERY`` seconds that compares that counter with what it last
+rendered and reruns the page when it moved. Viewers don't poll: at a few
+hundred open pages that tick alone would be a hundred script runs a second.
+
+``PROMO_WATCH=0`` turns the watcher off (a viewer's rerun still picks changes up).
+"""
+import logging, os, threading, time
+
+import assets
+import content
+import profiles
+import snapshot
+
+ENABLED = os.environ.get("PROMO_WATCH", "1") != "0"
+POLL_EVERY = float(os.environ.get("PROMO_WATCH_POLL", "1.0"))   # polling fallback only
+DEBOUNCE = float(os.environ.get("PROMO_WATCH_DEBOUNCE", "0.3"))
+LIVE = os.environ.get("PROMO_LIVE_RELOAD") == "1"   # every session polls, not just ?live=1
+RELOAD_EVERY = float(os.environ.get("PROMO_RELOAD_EVERY", "2.0"))
+CONTENT_EXTS = {".json"}
+
+log = logging.getLogger("promo.watch")
+_lock = threading.Lock()
+_wake = threading.Condition(_lock)
+_pending = {}          # path -> monotonic time of its last event
+_version = 0
+_started = False
+
+
+def version():
+    """Bumped once per applied batch of changes."""
+    return _version
+
+
+def roots():
+    """Directories to watch: the default document's, the profiles', the shared assets."""
+    default_dir = os.path.dirname(os.path.abspath(profiles.content_path("")))
+    dirs = [default_dir, profiles.PROFILES_DIR] + profiles.SHARED_ASSET_DIRS
+    out = []
+    for d in (os.path.abspath(d) for d in dirs if os.path.isdir(d)):
+        if not any(d == r or d.startswith(r + os.sep) for r in out):
+            out = [r for r in out if not r.startswith(d + os.sep)] + [d]
+    return out
+
+
+def _relevant(path):
+    if os.path.basename(path).startswith("."):  # editor swap files, remote.py's state
+        return False
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in CONTENT_EXTS and ext not in assets.IMAGE_EXTS:
+        return False
+    cache = os.path.abspath(assets.CACHE_DIR)
+    return not os.path.abspath(path).startswith(cache + os.sep)  # our own build output
+
+
+def notify(path):
+    """Record a change to ``path``; applied after ``DEBOUNCE`` seconds of quiet."""
+    if _relevant(path):
+        with _wake:
+            _pending[os.path.abspath(path)] = time.monotonic()
+            _wake.notify()
+
+
+def _apply(paths):
+    global _version
+    docs = [p for p in paths if os.path.splitext(p)[1].lower() in CONTENT_EXTS]
+    images = [p for p in paths if p not in docs]
+    profiles_dir = os.path.abspath(profiles.PROFILES_DIR)
+    if any(os.path.dirname(p) == profiles_dir for p in docs):
+        profiles.refresh()
+    for p in docs:
+        if os.path.exists(p):
+            try:
+                if snapshot.ENABLED and os.path.exists(snapshot.path_for(p)):
+                    snapshot.compile(p)  # keep the compiled copy in step with its source
+                content.load(p)  # parse once here, not once per session
+            except (OSError, ValueError) as e:  # half-written save: keep serving the old copy
+                log.warning("reload of %s failed: %s", p, e)
+    if images:
+        assets.rebuild()
+    with _lock:
+        _version += 1
+    log.info("reloaded %d file(s), version %d", len(paths), _version)
+
+
+def _flush_loop():
+    while True:
+        with _wake:
+            while not _pending:
+                _wake.wait()
+            quiet = DEBOUNCE - (time.monotonic() - max(_pending.values()))
+            if quiet > 0:
+                _wake.wait(quiet)
+                continue
+            batch = list(_pending)
+            _pending.clear()
+        try:
+            _apply(batch)
+        except Exception:
+            log.exception("hot reload failed")
+
+
+def _scan(dirs):
+    out = {}
+    for root in dirs:
+        for base, subdirs, files in os.walk(root):
+            for name in files:
+                path = os.path.join(base, name)
+                if _relevant(path):
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    out[path] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+def _poll_loop(dirs):
+    seen = _scan(dirs)
+    while True:
+        time.sleep(POLL_EVERY)
+        now = _scan(dirs)
+        for path in set(seen) | set(now):
+            if seen.get(path) != now.get(path):
+                notify(path)
+        seen = now
+
+
+def _observe(dirs):
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory or event.event_type in ("opened", "closed_no_write"):
+                return
+            notify(event.src_path)
+            if getattr(event, "dest_path", ""):
+                notify(event.dest_path)  # editors that save via rename
+
+    obs = Observer()
+    obs.daemon = True
+    for d in dirs:
+        obs.schedule(Handler(), d, recursive=True)
+    obs.start()
+    return obs
+
+
+def start():
+    """Start the watcher once per process (no-op when disabled or already running)."""
+    global _started
+    if not ENABLED or _started:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+    dirs = roots()
+    threading.Thread(target=_flush_loop, name="promo-reload", daemon=True).start()
+    try:
+        _observe(dirs)
+        log.info("watching %s (watchdog)", ", ".join(dirs))
+    except Exception as e:  # no watchdog, or inotify limits exhausted
+        log.info("watching %s (polling every %.1fs: %s)", ", ".join(dirs), POLL_EVERY, e)
+        threading.Thread(target=_poll_loop, args=(dirs,), name="promo-watch", daemon=True).start()